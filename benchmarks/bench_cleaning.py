@@ -0,0 +1,94 @@
+"""
+Times the cleaning step of get_dataframe on synthetic copies of the source
+CSV, comparing the column-spec pipeline against the previous row-wise one.
+
+Run from the repository root with `python -m benchmarks.bench_cleaning`.
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_raw_dataframe
+from dataset.get_dataset import clean_dataframe, read_source_csv
+
+
+def legacy_clean_dataframe(df):
+    """The row-wise cleaning get_dataframe used before the column-spec pipeline."""
+    df = df.drop("Unnamed: 0", axis=1)
+
+    percentages_as_strings = [
+        'Population with less than 9th grade education',
+        'Population with 9th to 12th grade education, no diploma',
+        'High School graduate and equivalent',
+        'Some College,No Degree',
+        'Associates Degree',
+        'Bachelors Degree',
+        'Graduate or professional degree'
+    ]
+
+    df[percentages_as_strings] = df[percentages_as_strings].apply(lambda x: x.str.replace('%', '').astype('float64')/100)
+
+    df.rename(columns={'Mean income (dollars)': 'x'}, inplace=True)
+    df['Mean income (dollars)'] = df['x'].apply(lambda x: x.replace('$', '').replace(',', '')).astype(int)
+    df.drop(columns=['x'], inplace=True)
+
+    df.rename(columns={'Median income (dollars)': 'x'}, inplace=True)
+    df['Median income (dollars)'] = df['x'].apply(
+        lambda x: int(x.replace('$', '').replace(',', '')) if x.replace('$', '').replace(',', '').lstrip('-').isdigit() else None
+    )
+    df.drop(columns=['x'], inplace=True)
+
+    out_of_scale_percentages = df.filter(regex='Percentage|percentage|%').columns
+
+    df[out_of_scale_percentages] = df[out_of_scale_percentages].apply(lambda x: x / 100 if x.max() > 1 else x)
+
+    df["state"] = df["state"].apply(
+        lambda name: "District of Columbia" if name == "DistrictofColumbia" else re.sub(r'([a-z])([A-Z])', r'\1 \2', name)
+    )
+
+    return df
+
+
+def best_of(repeat, function, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'scale':>6} {'rows':>9} {'legacy ingest':>14} {'spec ingest':>12} {'legacy clean':>13} {'spec clean':>11} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in args.scales:
+            csv_file_path = os.path.join(tmp_dir, f"synthetic-{scale}x.csv")
+            make_raw_dataframe(scale).to_csv(csv_file_path, index=False)
+
+            legacy_raw = pd.read_csv(csv_file_path)
+            spec_raw = read_source_csv(csv_file_path)
+
+            legacy_ingest = best_of(args.repeat, lambda: legacy_clean_dataframe(pd.read_csv(csv_file_path)))
+            spec_ingest = best_of(args.repeat, lambda: clean_dataframe(read_source_csv(csv_file_path)))
+            legacy_clean = best_of(args.repeat, legacy_clean_dataframe, legacy_raw)
+            spec_clean = best_of(args.repeat, clean_dataframe, spec_raw)
+
+            print(
+                f"{scale:>5}x {len(spec_raw):>9,} {legacy_ingest:>13.3f}s {spec_ingest:>11.3f}s "
+                f"{legacy_clean:>12.3f}s {spec_clean:>10.3f}s {legacy_clean / spec_clean:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
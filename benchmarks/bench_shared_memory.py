@@ -0,0 +1,91 @@
+"""
+Measures the memory used by several server-like processes that each load the
+dataset with get_dataframe, with and without DATASET_SHARED=1.
+
+Run from the repository root with `python -m benchmarks.bench_shared_memory`
+(Linux only, it reads /proc). Every worker loads a synthetic dataset, reads
+all of its numeric columns and waits while the proportional set size (PSS)
+of all workers is summed, so pages shared through the memory-mapped Arrow
+file are only counted once in total.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import make_raw_dataframe
+from dataset.get_dataset import SOURCE_POINTER_FILE
+
+WORKER_CODE = """
+import sys
+from dataset.get_dataset import get_dataframe
+
+if sys.argv[1] == "load":
+    df = get_dataframe()
+    df.select_dtypes("number").sum()
+print("ready", flush=True)
+sys.stdin.read()
+"""
+
+
+def get_pss_kb(pid):
+    with open(f"/proc/{pid}/smaps_rollup", "r") as file:
+        for line in file:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+
+    raise RuntimeError(f"No Pss in /proc/{pid}/smaps_rollup")
+
+
+def measure(workers, env, mode="load"):
+    """
+    Starts `workers` processes, waits until they all loaded the dataset (or
+    only imported it, with mode="import") and returns their total PSS in MB.
+    """
+    processes = [
+        subprocess.Popen([sys.executable, "-c", WORKER_CODE, mode], env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    try:
+        for process in processes:
+            # Skips what the dataset prints while loading, e.g. the compact mode report
+            if "ready" not in (line.strip() for line in process.stdout):
+                raise RuntimeError("A worker failed to load the dataset")
+
+        return sum(get_pss_kb(process.pid) for process in processes) / 1024
+    finally:
+        for process in processes:
+            process.stdin.close()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=50, help="Multiple of the county count of the synthetic dataset")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file_path = os.path.join(tmp_dir, "synthetic.csv")
+        make_raw_dataframe(args.scale).to_csv(csv_file_path, index=False)
+        with open(os.path.join(tmp_dir, SOURCE_POINTER_FILE), "w") as file:
+            file.write(csv_file_path)
+
+        env = {**os.environ, "DATASET_CACHE_DIR": tmp_dir, "DATASET_SHARED_DIR": tmp_dir}
+
+        # Builds the Parquet cache and the Arrow file once, so only loading is measured
+        subprocess.run([sys.executable, "-c", "from dataset.get_dataset import get_dataframe; get_dataframe()"],
+                       env={**env, "DATASET_SHARED": "1"}, check=True)
+
+        # The imports alone, to tell the interpreter and libraries apart from the dataset
+        print(f"{'workers':>7} {'imports (MB)':>13} {'private (MB)':>13} {'shared (MB)':>12}")
+        for workers in args.workers:
+            imports_mb = measure(workers, env, mode="import")
+            private_mb = measure(workers, {**env, "DATASET_SHARED": "0"})
+            shared_mb = measure(workers, {**env, "DATASET_SHARED": "1"})
+            print(f"{workers:>7} {imports_mb:>13.1f} {private_mb:>13.1f} {shared_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
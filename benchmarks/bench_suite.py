@@ -0,0 +1,143 @@
+"""
+Times the data pipeline and chart building of the dashboard on synthetic
+datasets at several multiples of the county count, and compares the results
+with a stored baseline.
+
+Run from the repository root with `python -m benchmarks.bench_suite`. The
+timings are written as JSON (to --output), and every step slower than the
+baseline by more than --tolerance is reported as a regression. Use
+--update-baseline to store the new timings as the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from benchmarks.bench_cleaning import best_of
+from benchmarks.synthetic import make_raw_dataframe
+from dataset.derived import get_county_votes_df, get_state_correlations, get_state_votes_df
+from dataset.get_dataset import clean_dataframe, read_source_csv
+from helpers.cdf_plot import CDFPlot
+from helpers.pdf_plot import PDFPlot
+from helpers.scatter_plot import scatter
+from helpers.violin_summary import summarize_violins, summary_violin_figure
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+DEFAULT_SCALES = [1, 10, 100]
+
+# Steps faster than this are too noisy to be compared with the baseline
+MIN_COMPARED_SECONDS = 0.05
+
+
+def benchmark_scale(scale, repeat, tmp_dir):
+    """Returns the number of rows and the best time in seconds of every step at `scale`."""
+    csv_file_path = os.path.join(tmp_dir, f"synthetic-{scale}x.csv")
+    make_raw_dataframe(scale).to_csv(csv_file_path, index=False)
+
+    df = clean_dataframe(read_source_csv(csv_file_path))
+    income = df["Mean income (dollars)"]
+
+    scatter_figure = scatter(df, x="Bachelors Degree", y="2020 Democrat vote %", color="state",
+                             size="Total Population", hover_name="county", size_max=60)
+    violin_figure = summary_violin_figure(
+        summarize_violins(df, "Mean income (dollars)", "state", "winner_party"), "state", "winner_party"
+    )
+
+    timings = {
+        "ingest": best_of(repeat, lambda: clean_dataframe(read_source_csv(csv_file_path))),
+        "get_county_votes_df": best_of(repeat, get_county_votes_df, df),
+        "get_state_votes_df": best_of(repeat, get_state_votes_df, df),
+        # calculate_state_correlation reads this table, computed once per dataset
+        "state_correlations": best_of(repeat, get_state_correlations, df),
+        "PDFPlot.plot": best_of(repeat, lambda: PDFPlot().plot(desired_percentile=0.5, real_data=income)),
+        "CDFPlot.plot": best_of(repeat, lambda: CDFPlot().plot(desired_percentile=0.5, real_data=income)),
+        "summarize_violins": best_of(repeat, summarize_violins, df, "Mean income (dollars)", "state", "winner_party"),
+        "scatter_figure_json": best_of(repeat, pio.to_json, scatter_figure),
+        "violin_figure_json": best_of(repeat, pio.to_json, violin_figure),
+    }
+
+    return {"rows": len(df), "seconds": timings}
+
+
+def compare(results, baseline, tolerance):
+    """Prints the ratio of every timing to the baseline and returns the regressions."""
+    regressions = []
+    for scale, result in results.items():
+        baseline_seconds = baseline.get(scale, {}).get("seconds", {})
+        for step, seconds in result["seconds"].items():
+            if step not in baseline_seconds:
+                continue
+
+            ratio = seconds / baseline_seconds[step]
+            is_compared = max(seconds, baseline_seconds[step]) >= MIN_COMPARED_SECONDS
+            flag = "  REGRESSION" if is_compared and ratio > 1 + tolerance else ""
+            print(f"{scale:>6} {step:<22} {baseline_seconds[step]:>10.4f}s {seconds:>10.4f}s {ratio:>7.2f}x{flag}")
+
+            if flag:
+                regressions.append((scale, step, ratio))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in args.scales:
+            results[f"{scale}x"] = benchmark_scale(scale, args.repeat, tmp_dir)
+
+            print(f"{scale}x ({results[f'{scale}x']['rows']:,} rows)")
+            for step, seconds in results[f"{scale}x"]["seconds"].items():
+                print(f"    {step:<22} {seconds:>10.4f}s")
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create it")
+        return
+
+    with open(args.baseline, "r") as file:
+        baseline = json.load(file)
+
+    print(f"\n{'scale':>6} {'step':<22} {'baseline':>11} {'current':>11} {'ratio':>8}")
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} step(s) slower than the baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
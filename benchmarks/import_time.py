@@ -0,0 +1,93 @@
+"""
+Reports the time each page spends importing modules on a cold start.
+
+Every page runs in a fresh interpreter with `-X importtime` (Streamlit in
+bare mode, so no server is started), and the self times of the imported
+modules are added up by top-level package.
+
+Run from the repository root with `python -m benchmarks.import_time`.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+RUN_PAGE = "import runpy, sys; sys.path.insert(0, {root!r}); runpy.run_path({page!r}, run_name='__main__')"
+
+
+def get_pages():
+    return ["main.py"] + sorted(os.path.relpath(path, ROOT) for path in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def parse_import_times(stderr):
+    """Returns the self time in microseconds of every module listed by -X importtime."""
+    self_times = {}
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_times[match.group(4)] = self_times.get(match.group(4), 0) + int(match.group(1))
+
+    return self_times
+
+
+def profile_page(page):
+    """Runs `page` once in a new interpreter and returns its import times and wall time."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_PAGE.format(root=ROOT, page=os.path.join(ROOT, page))],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall_time = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"{page} failed:\n{result.stderr[-2000:]}")
+
+    self_times = parse_import_times(result.stderr)
+    packages = Counter()
+    for module, self_time in self_times.items():
+        packages[module.split(".")[0]] += self_time
+
+    return {
+        "page": page,
+        "wall_seconds": wall_time,
+        "import_seconds": sum(self_times.values()) / 1e6,
+        "modules": len(self_times),
+        "packages": {package: self_time / 1e6 for package, self_time in packages.most_common()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="Pages to profile, relative to the repository root (default: all)")
+    parser.add_argument("--top", type=int, default=8, help="Packages listed per page")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    reports = []
+    for page in args.pages or get_pages():
+        report = profile_page(page)
+        reports.append(report)
+
+        print(f"{page}: {report['import_seconds']:.2f}s importing {report['modules']} modules "
+              f"({report['wall_seconds']:.2f}s wall)")
+        for package, seconds in list(report["packages"].items())[:args.top]:
+            print(f"    {package:<24} {seconds * 1000:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(reports, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
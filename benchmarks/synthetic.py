@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+FIPS_CSV_PATH = "./data/fips.csv"
+
+EDUCATION_COLUMNS = [
+    'Population with less than 9th grade education',
+    'Population with 9th to 12th grade education, no diploma',
+    'High School graduate and equivalent',
+    'Some College,No Degree',
+    'Associates Degree',
+    'Bachelors Degree',
+    'Graduate or professional degree',
+]
+
+ETHNICITY_COLUMNS = [
+    'Hispanic or Latino percentage',
+    'NH-White percentage',
+    'NH-Black percentage',
+    'NH-American Indian and Alaska Native percentage',
+    'NH-Asian percentage',
+    'NH-Native Hawaiian and Other Pacific Islander percentage',
+    'NH-Some Other Race percentage',
+]
+
+
+def get_base_counties():
+    """
+    Returns the (state, county) pairs of data/fips.csv, with the state names
+    written the way the source CSV writes them ("NewYork", "DistrictofColumbia").
+    """
+    fips_df = pd.read_csv(FIPS_CSV_PATH)
+
+    state_rows = fips_df[(fips_df["fips"] % 1000 == 0) & (fips_df["fips"] > 0)]
+    state_names = pd.Series(
+        state_rows["name"].str.title().str.replace(" ", "").str.replace("Of", "of").values,
+        index=state_rows["fips"].values // 1000,
+    )
+
+    county_rows = fips_df[fips_df["fips"] % 1000 != 0]
+
+    return pd.DataFrame({
+        "state": (county_rows["fips"] // 1000).map(state_names).values,
+        "county": county_rows["name"].values,
+    })
+
+
+def make_raw_dataframe(scale=1, seed=0):
+    """
+    Builds a frame with the same columns and value formats as
+    US_Election_dataset_v1.csv, with `scale` times as many counties.
+    """
+    rng = np.random.default_rng(seed)
+
+    base = get_base_counties()
+    df = pd.DataFrame({
+        "state": np.tile(base["state"].values, scale),
+        "county": np.tile(base["county"].values, scale),
+    })
+    n = len(df)
+
+    democrat = rng.integers(100, 500_000, n)
+    republican = rng.integers(100, 500_000, n)
+    other = rng.integers(0, 20_000, n)
+    total = democrat + republican + other
+
+    df["2020 Democrat vote raw"] = democrat
+    df["2020 Democrat vote %"] = democrat / total * 100
+    df["2020 Republican vote raw"] = republican
+    df["2020 Republican vote %"] = republican / total * 100
+    df["2020 other vote raw"] = other
+    df["2020 other vote %"] = other / total * 100
+
+    for column in EDUCATION_COLUMNS:
+        df[column] = np.char.add(np.round(rng.uniform(0, 40, n), 1).astype(str), "%")
+
+    median_income = rng.integers(20_000, 150_000, n)
+    mean_income = (median_income * rng.uniform(1.05, 1.4, n)).astype(int)
+
+    df["Gini Index"] = rng.uniform(0.3, 0.6, n)
+    df["Median income (dollars)"] = [f"${value:,}" for value in median_income]
+    df["Mean income (dollars)"] = [f"${value:,}" for value in mean_income]
+    # The source has a handful of counties without a median income.
+    df.loc[rng.choice(n, size=max(1, n // 1000), replace=False), "Median income (dollars)"] = "-"
+    df["Total Population"] = rng.integers(100, 2_000_000, n)
+
+    shares = rng.dirichlet(np.ones(len(ETHNICITY_COLUMNS)), n) * 100
+    for index, column in enumerate(ETHNICITY_COLUMNS):
+        df[column] = shares[:, index]
+
+    df.insert(0, "Unnamed: 0", np.arange(n))
+
+    return df
@@ -0,0 +1,131 @@
+"""
+Bootstrap confidence intervals of Pearson and Spearman correlations.
+
+Replicates are drawn in chunks as (replicates, rows) index matrices, so one
+chunk resamples and correlates all of its replicates with a few array
+operations. Chunks are spread over a process pool when the work is large
+enough to pay for it, and seeded from a SeedSequence per chunk, so the
+interval of a given pair does not depend on the number of workers.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PEARSON = "pearson"
+SPEARMAN = "spearman"
+METHODS = [PEARSON, SPEARMAN]
+METHOD_NAMES = {PEARSON: "Pearson", SPEARMAN: "Spearman"}
+
+BOOTSTRAP_REPLICATES = 2000
+CONFIDENCE_LEVEL = 0.95
+
+# Resampled values per chunk (replicates x rows); bounds the memory of a chunk
+CHUNK_CELLS = 1 << 20
+# Below this many resampled values the pool costs more than it saves
+PARALLEL_MIN_CELLS = 1 << 22
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_workers():
+    """Processes of the pool: BOOTSTRAP_WORKERS when set, one per CPU otherwise."""
+    return int(os.environ.get("BOOTSTRAP_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def get_pool():
+    """The process pool shared by every session, started on first use."""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Forking a multithreaded server is unsafe, so the workers are spawned
+                _pool = ProcessPoolExecutor(max_workers=get_workers(), mp_context=multiprocessing.get_context("spawn"))
+
+    return _pool
+
+
+def rowwise_pearson(x, y):
+    """The Pearson correlation of each row of x with the same row of y."""
+    x = x - x.mean(axis=1, keepdims=True)
+    y = y - y.mean(axis=1, keepdims=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.clip((x * y).sum(axis=1) / np.sqrt((x * x).sum(axis=1) * (y * y).sum(axis=1)), -1, 1)
+
+
+def resample_ranks(values, indices):
+    """
+    The average ranks of values[indices] within each row of `indices`.
+
+    Instead of sorting every resample, the number of times each distinct
+    value is drawn is counted per row; its cumulative count in value order
+    gives the ranks of all of its copies at once.
+    """
+    distinct_values, codes = np.unique(values, return_inverse=True)
+    codes = codes[indices]
+
+    n_rows, n_distinct = len(indices), len(distinct_values)
+    offsets = np.arange(n_rows)[:, None] * n_distinct
+    counts = np.bincount((codes + offsets).ravel(), minlength=n_rows * n_distinct).reshape(n_rows, n_distinct)
+    average_ranks = np.cumsum(counts, axis=1) - (counts - 1) / 2
+
+    return np.take_along_axis(average_ranks, codes, axis=1)
+
+
+def resampled_correlation(x, y, indices, method):
+    """The correlation of x[indices] and y[indices] in each row of `indices`."""
+    if method == SPEARMAN:
+        return rowwise_pearson(resample_ranks(x, indices), resample_ranks(y, indices))
+
+    return rowwise_pearson(x[indices], y[indices])
+
+
+def correlation_replicates(x, y, method, seed, replicates):
+    """Correlations of `replicates` resamples of the (x, y) rows, drawn from `seed`."""
+    indices = np.random.default_rng(seed).integers(0, len(x), size=(replicates, len(x)))
+    return resampled_correlation(x, y, indices, method)
+
+
+def bootstrap_correlation(x, y, method=PEARSON, replicates=BOOTSTRAP_REPLICATES, level=CONFIDENCE_LEVEL, seed=0):
+    """
+    Returns the correlation of x and y and its percentile bootstrap interval
+    at `level`, as a dict with estimate, low, high and n. Rows where x or y
+    is missing are dropped; fewer than three rows give NaN bounds.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+
+    n = len(x)
+    estimate = resampled_correlation(x, y, np.arange(n)[None, :], method)[0] if n >= 2 else np.nan
+    if n < 3:
+        return {"estimate": estimate, "low": np.nan, "high": np.nan, "n": n}
+
+    chunk_size = max(1, CHUNK_CELLS // n)
+    chunk_sizes = [min(chunk_size, replicates - start) for start in range(0, replicates, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    arguments = ([x] * len(seeds), [y] * len(seeds), [method] * len(seeds), seeds, chunk_sizes)
+
+    if get_workers() > 1 and n * replicates >= PARALLEL_MIN_CELLS:
+        chunks = list(get_pool().map(correlation_replicates, *arguments))
+    else:
+        chunks = list(map(correlation_replicates, *arguments))
+
+    alpha = (1 - level) / 2
+    low, high = np.nanquantile(np.concatenate(chunks), [alpha, 1 - alpha])
+
+    return {"estimate": estimate, "low": low, "high": high, "n": n}
+
+
+def format_interval(interval):
+    """The estimate with its interval below, for the cells of the heatmaps."""
+    if np.isnan(interval["low"]):
+        return f"{interval['estimate']:.2f}"
+
+    return f"{interval['estimate']:.2f}<br>[{interval['low']:.2f}, {interval['high']:.2f}]"
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+ETHNICITY_COLUMNS = [
+    "Hispanic or Latino percentage",
+    "NH-White percentage",
+    "NH-Black percentage",
+    "NH-American Indian and Alaska Native percentage",
+    "NH-Asian percentage",
+    "NH-Native Hawaiian and Other Pacific Islander percentage",
+    "NH-Some Other Race percentage",
+]
+
+PARTY_VOTE_COLUMNS = {
+    "Democrats": "2020 Democrat vote raw",
+    "Republicans": "2020 Republican vote raw",
+    "Others": "2020 other vote raw",
+}
+
+
+def grouped_pearson(df, group_column, x_columns, y_columns):
+    """
+    Computes the Pearson correlation of every (x, y) column pair within each
+    group of `group_column`, in a single pass over the rows.
+
+    Each group only needs the sums of x, y, x², y² and xy, which are added up
+    for all groups and column pairs at once. As in Series.corr, rows where x
+    or y is missing are ignored, and groups with fewer than two rows or a
+    constant column get NaN.
+
+    Returns:
+        A DataFrame indexed by group, with one (x column, y column) pair per
+        column.
+    """
+    codes, groups = pd.factorize(df[group_column], sort=True)
+    x = df[list(x_columns)].to_numpy(dtype="float64")
+    y = df[list(y_columns)].to_numpy(dtype="float64")
+
+    # Correlations do not change when a constant is subtracted from a column;
+    # centering keeps the sums of squares small, which avoids precision loss.
+    x = x - np.nanmean(x, axis=0)
+    y = y - np.nanmean(y, axis=0)
+
+    if np.isnan(x).any() or np.isnan(y).any():
+        valid = ~np.isnan(x)[:, :, None] & ~np.isnan(y)[:, None, :]
+        xs = np.where(valid, x[:, :, None], 0.0)
+        ys = np.where(valid, y[:, None, :], 0.0)
+        terms = [valid, xs, ys, xs * xs, ys * ys, xs * ys]
+    else:
+        pair_shape = (len(x), x.shape[1], y.shape[1])
+        xs = np.broadcast_to(x[:, :, None], pair_shape)
+        ys = np.broadcast_to(y[:, None, :], pair_shape)
+        terms = [np.ones(pair_shape), xs, ys, xs * xs, ys * ys, xs * ys]
+
+    sums = group_sums(codes, len(groups), np.stack(terms, axis=-1).reshape(len(x), -1))
+    n, sx, sy, sxx, syy, sxy = np.moveaxis(sums.reshape(len(groups), x.shape[1], y.shape[1], 6), -1, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = n * sxy - sx * sy
+        variance_x = n * sxx - sx * sx
+        variance_y = n * syy - sy * sy
+        correlation = covariance / np.sqrt(variance_x * variance_y)
+
+    correlation[(n < 2) | (variance_x <= 0) | (variance_y <= 0)] = np.nan
+
+    return pd.DataFrame(
+        np.clip(correlation, -1, 1).reshape(len(groups), -1),
+        index=pd.Index(groups, name=group_column),
+        columns=pd.MultiIndex.from_product([list(x_columns), list(y_columns)]),
+    )
+
+
+def group_sums(codes, n_groups, values):
+    """Sums the rows of `values` by group code, every column at once."""
+    # Rows that are already grouped, as the states of the dataset are, are summed in place
+    if np.any(codes[1:] < codes[:-1]):
+        order = np.argsort(codes, kind="stable")
+        codes, values = codes[order], values[order]
+
+    starts = np.searchsorted(codes, np.arange(n_groups))
+
+    return np.add.reduceat(values, starts, axis=0)
@@ -0,0 +1,350 @@
+"""
+Tables derived from the cleaned dataset, declared as the nodes of a small
+dependency graph.
+
+Each node is computed the first time it is requested, memoized, and shared by
+every page and session of the process. Invalidating a node (for instance the
+"dataset" node after the source changes) makes every node that depends on it
+recompute on its next request.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dataset.bootstrap import PEARSON, bootstrap_correlation
+from dataset.correlation import ETHNICITY_COLUMNS, PARTY_VOTE_COLUMNS, grouped_pearson
+from dataset.get_dataset import get_dataframe, make_read_only
+from dataset.regression import fit_lines
+from dataset.winner_party import DEMOCRATS, REPUBLICANS, VOTE_COLUMNS, classify_winner
+from helpers.lazy_import import lazy_import
+from helpers.timing import span
+from helpers.violin_summary import summarize_violins
+
+stats = lazy_import("scipy.stats")
+
+# Row of the income fits and percentile tables that covers every county.
+ALL_STATES = "All"
+
+# Vote percentage columns of the "state_votes" table, by party.
+STATE_VOTE_PERCENTAGE_COLUMNS = {
+    DEMOCRATS: "democrat_percentage",
+    REPUBLICANS: "republican_percentage",
+    "Others": "other_percentage",
+}
+
+# The percentile tables have one column per percent, from 0 to 100.
+PERCENTILE_STEPS = 100
+
+
+class DerivedGraph:
+    def __init__(self):
+        self._nodes = {}
+        self._memo = {}
+        self._versions = {}
+        self._lock = threading.RLock()
+
+    def node(self, name, *dependencies):
+        """
+        Declares `name` as the result of the decorated function, which
+        receives the values of `dependencies` as positional arguments.
+        """
+        def register(function):
+            for dependency in dependencies:
+                if dependency not in self._nodes:
+                    raise KeyError(f"Unknown dependency '{dependency}' of '{name}'")
+
+            self._nodes[name] = (function, dependencies)
+            self._versions[name] = 0
+            return function
+
+        return register
+
+    def get(self, name):
+        """
+        Returns the value of `name`, computing it and its dependencies when
+        they are missing or out of date. DataFrames are returned as read-only
+        shallow copies, as get_dataframe does.
+        """
+        value = self._get(name)
+        return value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+
+    def invalidate(self, name):
+        """Drops the value of `name`, so it and the nodes depending on it are recomputed."""
+        with self._lock:
+            self._memo.pop(name, None)
+            self._versions[name] += 1
+
+    def _get(self, name):
+        with self._lock:
+            function, dependencies = self._nodes[name]
+            values = [self._get(dependency) for dependency in dependencies]
+            dependency_versions = tuple(self._versions[dependency] for dependency in dependencies)
+
+            memo = self._memo.get(name)
+            if memo is not None and memo[1] == dependency_versions:
+                return memo[0]
+
+            with span("transform", node=name):
+                value = function(*values)
+            if isinstance(value, pd.DataFrame):
+                value = make_read_only(value)
+
+            if memo is not None:
+                self._versions[name] += 1
+            self._memo[name] = (value, dependency_versions)
+
+            return value
+
+
+derived = DerivedGraph()
+
+
+def get_derived(name):
+    return derived.get(name)
+
+
+@derived.node("dataset")
+def load_dataset():
+    return get_dataframe()
+
+
+# Node of each column derived from the dataset, by column name, see derived_column
+DERIVED_COLUMNS = {}
+
+
+def derived_column(name):
+    """
+    Declares `name` as a column derived from the dataset: the decorated
+    function receives the whole dataset and returns the column, which is
+    computed once and memoized as a node of the graph.
+    """
+    def register(function):
+        node_name = f"column:{name}"
+
+        @derived.node(node_name, "dataset")
+        def compute_column(df):
+            return pd.DataFrame({name: function(df)}, index=df.index, copy=False)
+
+        DERIVED_COLUMNS[name] = node_name
+        return function
+
+    return register
+
+
+def with_columns(df, *names):
+    """
+    Returns `df`, the dataset or rows of it such as get_state_rows returns,
+    with the derived columns `names` attached.
+
+    Pages use it instead of adding columns to the shared frame: neither the
+    columns of `df` nor the derived ones are copied, the result only holds
+    read-only views of them.
+    """
+    columns = {column: df[column] for column in df.columns}
+    for name in names:
+        values = get_derived(DERIVED_COLUMNS[name])[name]
+        if isinstance(df.index, pd.RangeIndex) and df.index.step == 1:
+            columns[name] = values.iloc[df.index.start:df.index.stop]
+        else:
+            columns[name] = values.loc[df.index]
+
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+@derived_column("most_voted_party")
+def get_most_voted_party(df):
+    # The winner of each county is classified once, when the dataset is cleaned
+    return df["winner_party"]
+
+
+@derived.node("state_votes", "dataset")
+def get_state_votes_df(df):
+    # Compact datasets store the votes in narrower integers, which the state totals could overflow
+    state_votes_df = df[VOTE_COLUMNS].astype("int64").groupby(df["state"], observed=True).sum()
+
+    state_votes_df["total_votes"] = state_votes_df.sum(axis=1)
+
+    state_votes_df["democrat_percentage"] = (state_votes_df["2020 Democrat vote raw"] / state_votes_df["total_votes"])
+    state_votes_df["republican_percentage"] = (state_votes_df["2020 Republican vote raw"] / state_votes_df["total_votes"])
+    state_votes_df["other_percentage"] = (state_votes_df["2020 other vote raw"] / state_votes_df["total_votes"])
+
+    state_votes_df["winner_party"] = classify_winner(state_votes_df[VOTE_COLUMNS])
+
+    state_votes_df.reset_index(inplace=True)
+
+    return state_votes_df
+
+
+@derived.node("county_votes", "dataset")
+def get_county_votes_df(df):
+    # The "fips" and "winner_party" columns are computed once, when the
+    # dataset is cleaned. The columns are renamed without copying them.
+    renames = {
+        "2020 Republican vote %": "republican_percentage",
+        "2020 Democrat vote %": "democrat_percentage",
+        "2020 other vote %": "other_percentage",
+    }
+
+    return pd.DataFrame({renames.get(column, column): df[column] for column in df.columns}, index=df.index, copy=False)
+
+
+@derived.node("state_offsets", "dataset")
+def get_state_offsets(df):
+    """
+    The first and past-the-end row of every state in the dataset, which is
+    sorted by state, indexed by state name.
+    """
+    if not df["state"].is_monotonic_increasing:
+        raise ValueError("The dataset must be sorted by state")
+
+    states = df["state"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, states[1:] != states[:-1]])
+    stops = np.r_[starts[1:], len(states)]
+
+    return pd.DataFrame({"start": starts, "stop": stops}, index=pd.Index(states[starts], name="state"))
+
+
+def get_states():
+    """The names of the states of the dataset, in alphabetical order."""
+    return get_derived("state_offsets").index.tolist()
+
+
+def get_state_rows(state):
+    """
+    Returns the counties of `state` as a slice of the shared dataset, without
+    scanning or copying its rows. As with get_dataframe, the values are
+    read-only but columns may be added to the returned frame.
+    """
+    start, stop = get_derived("state_offsets").loc[state]
+    return get_derived("dataset").iloc[start:stop].copy(deep=False)
+
+
+@derived.node("state_means", "dataset")
+def get_state_means_df(df):
+    return df.groupby("state", observed=True).mean(numeric_only=True)
+
+
+@derived.node("state_correlations", "dataset")
+def get_state_correlations(df):
+    """
+    The per-state correlation of every ethnicity column with every party vote
+    column, see grouped_pearson.
+    """
+    return grouped_pearson(df, "state", ETHNICITY_COLUMNS, PARTY_VOTE_COLUMNS.values())
+
+
+def calculate_state_correlation(ethnicity_type, party_type):
+    party_column = PARTY_VOTE_COLUMNS.get(party_type, PARTY_VOTE_COLUMNS["Others"])
+    correlations = get_derived("state_correlations")[(ethnicity_type, party_column)]
+
+    return correlations.rename("correlation").reset_index()
+
+
+@derived.node("ethnicity_vote_trendlines", "state_votes", "state_means")
+def get_ethnicity_vote_trendlines(state_votes, state_means):
+    """
+    The least squares lines of the party vote percentages of each state
+    against its mean ethnicity percentages, among the states won by each
+    party. Indexed by (winner party, party, ethnicity column), see fit_lines.
+    """
+    states = state_votes.merge(state_means[ETHNICITY_COLUMNS].reset_index(), on="state")
+
+    fits = {}
+    for winner_party in [DEMOCRATS, REPUBLICANS]:
+        winner_states = states[states["winner_party"] == winner_party]
+        for party, column in STATE_VOTE_PERCENTAGE_COLUMNS.items():
+            # Every ethnicity column is fitted at once
+            fits[(winner_party, party)] = fit_lines(winner_states[ETHNICITY_COLUMNS], winner_states[column])
+
+    return pd.concat(fits, names=["winner_party", "party", "ethnicity"])
+
+
+def get_ethnicity_vote_trendline(winner_party, party, ethnicity_type):
+    return get_derived("ethnicity_vote_trendlines").loc[(winner_party, party, ethnicity_type)]
+
+
+@derived.node("mean_income_fits", "dataset")
+def get_mean_income_fits(df):
+    """
+    The mean and standard deviation of the county mean incomes of each state,
+    and of every county in the ALL_STATES row, which define the normal curves
+    of the income distribution charts.
+    """
+    income = df["Mean income (dollars)"].astype("float64")
+    by_state = income.groupby(df["state"], observed=True)
+
+    fits = pd.DataFrame({"mean": by_state.mean(), "std_deviation": by_state.std(ddof=0)})
+    # A categorical state index could not take the ALL_STATES row
+    fits.index = fits.index.astype(str)
+    fits.loc[ALL_STATES] = [income.mean(), income.std(ddof=0)]
+
+    return fits
+
+
+@derived.node("mean_income_percentiles", "mean_income_fits")
+def get_mean_income_percentiles(fits):
+    """The income at each percent (0 to 100) of the normal curve of every row of the fits."""
+    percentiles = np.arange(PERCENTILE_STEPS + 1) / PERCENTILE_STEPS
+
+    # States with a single county have a zero standard deviation and get NaN.
+    with np.errstate(invalid="ignore"):
+        values = stats.norm.ppf(
+            percentiles[None, :],
+            loc=fits["mean"].to_numpy()[:, None],
+            scale=fits["std_deviation"].to_numpy()[:, None],
+        )
+
+    return pd.DataFrame(values, index=fits.index, columns=pd.RangeIndex(PERCENTILE_STEPS + 1, name="percent"))
+
+
+@derived.node("mean_income_violins", "dataset")
+def get_mean_income_violins(df):
+    """The violin summaries of the county mean incomes, by state and winner party."""
+    return summarize_violins(df, "Mean income (dollars)", "state", "winner_party")
+
+
+@derived.node("median_income_violins", "dataset")
+def get_median_income_violins(df):
+    """The violin summaries of the county median incomes, by state and winner party."""
+    return summarize_violins(df, "Median income (dollars)", "state", "winner_party")
+
+
+def get_mean_income_fit(state, percentile):
+    """
+    Returns the precomputed mean, standard deviation and value at `percentile`
+    of the mean income curve of `state` (or ALL_STATES), as keyword arguments
+    of PDFPlot.plot and CDFPlot.plot.
+    """
+    fit = get_derived("mean_income_fits").loc[state]
+    x_percent = get_derived("mean_income_percentiles").loc[state, round(percentile * PERCENTILE_STEPS)]
+
+    return {"mean": fit["mean"], "std_deviation": fit["std_deviation"], "x_percent": x_percent}
+
+
+_correlation_intervals = {}
+_correlation_intervals_lock = threading.Lock()
+
+
+def get_correlation_interval(state, x_column, y_column, method=PEARSON):
+    """
+    Returns the correlation of `x_column` and `y_column` over the counties
+    of `state` (or ALL_STATES) with its bootstrap confidence interval, see
+    bootstrap_correlation. Each pair is computed once per process and state.
+    """
+    # The correlation is symmetric, so (x, y) and (y, x) share the same entry
+    key = (state, *sorted((x_column, y_column)), method)
+
+    with _correlation_intervals_lock:
+        if key in _correlation_intervals:
+            return _correlation_intervals[key]
+
+    df = get_derived("dataset") if state == ALL_STATES else get_state_rows(state)
+
+    with span("transform", node="correlation_interval"):
+        interval = bootstrap_correlation(df[key[1]].to_numpy(), df[key[2]].to_numpy(), method)
+
+    with _correlation_intervals_lock:
+        _correlation_intervals[key] = interval
+
+    return interval
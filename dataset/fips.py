@@ -0,0 +1,168 @@
+"""
+Resolves (state, county) pairs of the dataset to 5 digit county FIPS codes
+using data/fips.csv.
+
+County names are compared after normalization (case, accents, punctuation,
+spacing and abbreviations such as "St." for "Saint"), then without their
+"County"/"Parish"/... suffix, and finally by character trigram similarity
+within the same state.
+"""
+import os
+import re
+import threading
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+FIPS_CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "fips.csv")
+
+# Minimum trigram Jaccard similarity for a fuzzy match to be accepted.
+FUZZY_MATCH_THRESHOLD = 0.6
+
+ABBREVIATIONS = {
+    "st": "saint",
+    "ste": "sainte",
+    "ft": "fort",
+    "mt": "mount",
+}
+
+# Longest suffixes first, so "city and borough" is removed before "borough".
+COUNTY_SUFFIXES = [
+    ("city", "and", "borough"),
+    ("census", "area"),
+    ("county",),
+    ("parish",),
+    ("borough",),
+    ("municipality",),
+]
+
+
+def normalize_name(name):
+    """
+    Returns the tokens of `name` in lower case, without accents or
+    punctuation and with abbreviations expanded:
+    "St. Mary's Parish" -> ["saint", "marys", "parish"].
+    """
+    name = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    name = name.lower().replace("&", " and ").replace("'", "")
+
+    return [ABBREVIATIONS.get(token, token) for token in re.findall(r"[a-z0-9]+", name)]
+
+
+def county_key(county):
+    return "".join(normalize_name(county))
+
+
+def county_stem(county):
+    tokens = normalize_name(county)
+    for suffix in COUNTY_SUFFIXES:
+        if len(tokens) > len(suffix) and tuple(tokens[-len(suffix):]) == suffix:
+            tokens = tokens[:-len(suffix)]
+            break
+
+    return "".join(tokens)
+
+
+def trigrams(text):
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class FipsResolver:
+    def __init__(self, fips_df):
+        fips_df = fips_df[fips_df["fips"] > 0]
+        state_codes = fips_df["fips"] // 1000
+        is_state_row = fips_df["fips"] % 1000 == 0
+
+        county_df = fips_df[~is_state_row]
+        abbreviation_by_code = county_df.groupby(state_codes[~is_state_row])["state"].first()
+
+        state_df = fips_df[is_state_row]
+        self.state_abbreviations = {
+            county_key(name): abbreviation_by_code[code]
+            for name, code in zip(state_df["name"], state_codes[is_state_row])
+            if code in abbreviation_by_code.index
+        }
+
+        self.index = {}
+        stems = {}
+        self.candidates = {}
+        for fips, name, state in zip(county_df["fips"], county_df["name"], county_df["state"]):
+            code = f"{fips:05d}"
+            self.index[(state, county_key(name))] = code
+
+            stem = county_stem(name)
+            stems.setdefault((state, stem), []).append(code)
+            self.candidates.setdefault(state, []).append((trigrams(stem), code))
+
+        # A stem shared by two counties of a state ("Fairfax County" and
+        # "Fairfax city") cannot identify either of them.
+        self.stem_index = {key: codes[0] for key, codes in stems.items() if len(codes) == 1}
+
+    def get_state_abbreviation(self, state):
+        return self.state_abbreviations.get(county_key(state))
+
+    def resolve(self, state, county):
+        """Returns the FIPS code of `county` in `state`, or None when it cannot be found."""
+        abbreviation = self.get_state_abbreviation(state)
+        if abbreviation is None:
+            return None
+
+        code = self.index.get((abbreviation, county_key(county)))
+        if code is not None:
+            return code
+
+        stem = county_stem(county)
+        code = self.stem_index.get((abbreviation, stem))
+        if code is not None:
+            return code
+
+        return self.fuzzy_resolve(abbreviation, stem)
+
+    def fuzzy_resolve(self, abbreviation, stem):
+        grams = trigrams(stem)
+        best_score, best_code, tied = 0.0, None, False
+        for candidate_grams, code in self.candidates.get(abbreviation, []):
+            score = len(grams & candidate_grams) / len(grams | candidate_grams)
+            if score > best_score:
+                best_score, best_code, tied = score, code, False
+            elif score == best_score:
+                tied = True
+
+        if best_score < FUZZY_MATCH_THRESHOLD or tied:
+            return None
+
+        return best_code
+
+    def resolve_many(self, states, counties):
+        """
+        Resolves aligned Series of states and counties, looking up each
+        distinct pair only once.
+        """
+        state_codes, state_names = pd.factorize(states)
+        county_codes, county_names = pd.factorize(counties)
+        codes, pairs = pd.factorize(state_codes * len(county_names) + county_codes)
+
+        resolved = np.array([
+            self.resolve(state_names[pair // len(county_names)], county_names[pair % len(county_names)])
+            for pair in pairs
+        ], dtype=object)
+
+        return pd.Series(resolved[codes], index=states.index, name="fips")
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_fips_resolver():
+    """Returns the resolver built from data/fips.csv, created once per process."""
+    global _resolver
+
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = FipsResolver(pd.read_csv(FIPS_CSV_PATH, dtype={"state": str}, keep_default_na=False))
+
+    return _resolver
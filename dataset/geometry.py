@@ -0,0 +1,126 @@
+"""
+State and county boundaries for the choropleth pages.
+
+The GeoJSON files are bundled in data/geo, so drawing a map never touches the
+network or writes to disk. They were built from the US Census Bureau
+cartographic boundary files (cb_2016_us_state_500k for states and
+gz_2010_us_050_00_500k for counties):
+
+- us-states.json: one feature per state, plus DC and Puerto Rico, with the
+  state name in `properties.name`.
+- us-counties.json: one feature per county, with the 5 digit FIPS code as the
+  feature `id`.
+
+Maps are drawn with get_map_geojson, which simplifies the boundaries (see
+dataset.topology) to the detail their zoom can show and keeps only the
+features being colored.
+"""
+import os
+import threading
+
+from dataset.topology import Topology
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+STATES = "states"
+COUNTIES = "counties"
+
+GEO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "geo")
+GEOJSON_FILES = {
+    STATES: "us-states.json",
+    COUNTIES: "us-counties.json",
+}
+
+# Where the figures find the location of each feature (their featureidkey)
+FEATURE_ID_KEYS = {
+    STATES: "properties.name",
+    COUNTIES: "id",
+}
+
+# Zooms the simplified boundaries are made for; a map gets the first one at or
+# above its own zoom, and the full boundaries beyond the last one
+DETAIL_ZOOMS = [3, 5, 7]
+# Width of the map tiles in pixels, that is of the whole world at zoom 0
+TILE_SIZE = 512
+
+_geojson = {}
+_geojson_lock = threading.Lock()
+
+_topologies = {}
+_topologies_lock = threading.Lock()
+
+_simplified = {}
+_simplified_lock = threading.Lock()
+
+
+def get_geojson(level):
+    """
+    Returns the parsed GeoJSON of `level` (STATES or COUNTIES). Each file is
+    read and parsed once per process; every caller gets the same object, so it
+    must not be modified.
+    """
+    if level not in _geojson:
+        with _geojson_lock:
+            if level not in _geojson:
+                with open(os.path.join(GEO_DIR, GEOJSON_FILES[level]), "rb") as file:
+                    _geojson[level] = _json.loads(file.read())
+
+    return _geojson[level]
+
+
+def get_topology(level):
+    """Returns the Topology of `level`, built once per process."""
+    if level not in _topologies:
+        with _topologies_lock:
+            if level not in _topologies:
+                _topologies[level] = Topology(get_geojson(level))
+
+    return _topologies[level]
+
+
+def get_detail_zoom(zoom):
+    """The first of DETAIL_ZOOMS at or above `zoom`, or None when it is beyond them all."""
+    return next((detail_zoom for detail_zoom in DETAIL_ZOOMS if detail_zoom >= zoom), None)
+
+
+def get_simplified_geojson(level, detail_zoom):
+    """
+    Returns the boundaries of `level` simplified by half a pixel at
+    `detail_zoom`, with no property other than the feature id. Each one is
+    built once per process and shared, so it must not be modified.
+    """
+    key = (level, detail_zoom)
+    if key not in _simplified:
+        with _simplified_lock:
+            if key not in _simplified:
+                tolerance = 360 / (TILE_SIZE * 2 ** detail_zoom) / 2
+                properties = ["name"] if level == STATES else []
+                _simplified[key] = get_topology(level).to_geojson(tolerance, properties)
+
+    return _simplified[key]
+
+
+def get_feature_id(feature, level):
+    if level == STATES:
+        return feature["properties"]["name"]
+    return feature["id"]
+
+
+def get_map_geojson(level, zoom, ids=None):
+    """
+    Returns the boundaries of `level` to draw a map at `zoom`, with only the
+    features whose id is in `ids` when it is given.
+    """
+    detail_zoom = get_detail_zoom(zoom)
+    geojson = get_geojson(level) if detail_zoom is None else get_simplified_geojson(level, detail_zoom)
+    if ids is None:
+        return geojson
+
+    ids = set(ids)
+    return {
+        "type": "FeatureCollection",
+        "features": [feature for feature in geojson["features"] if get_feature_id(feature, level) in ids],
+    }
@@ -1,53 +1,332 @@
-import kagglehub
+import hashlib
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import os
-import re
+import threading
+
+from dataset.fips import FIPS_CSV_PATH, get_fips_resolver
+from dataset.winner_party import PERCENTAGE_COLUMNS, VOTE_COLUMNS, classify_winner
+from helpers.lazy_import import lazy_import
+from helpers.timing import span
+
+# Only needed when the source CSV has to be located, and slow to import
+kagglehub = lazy_import("kagglehub")
+
+# Bump this whenever the cleaning steps below change, so that cached files
+# produced by an older version of the code are rebuilt.
+CLEANING_VERSION = 5
+
+CACHE_DIR = os.environ.get(
+    "DATASET_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+# With DATASET_COMPACT=1 the shared frame uses categorical state/county
+# columns, float32 fractions and the narrowest integer type of each count
+# column, see compact_dataframe.
+COMPACT_MODE = os.environ.get("DATASET_COMPACT", "0") not in ("", "0")
+# With DATASET_SHARED=1 the shared frame is written once as an uncompressed
+# Arrow IPC file in SHARED_DIR and memory-mapped read-only by every server
+# process, so the numeric columns share the same physical pages.
+SHARED_MODE = os.environ.get("DATASET_SHARED", "0") not in ("", "0")
+SHARED_DIR = os.environ.get("DATASET_SHARED_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else CACHE_DIR)
+
+CSV_FILE_NAME = "US_Election_dataset_v1.csv"
+SOURCE_POINTER_FILE = "source_csv_path.txt"
+
+
+_dataframe = None
+_dataframe_lock = threading.Lock()
+
+
 def get_dataframe():
+    """
+    Returns the cleaned dataset shared by every page and session of the
+    process. It is loaded on the first call only.
+
+    The values of the returned frame are read-only: it is a shallow copy of
+    the shared frame, so callers may add or replace columns on it, but any
+    attempt to modify the shared values in place raises a ValueError.
+    """
+    global _dataframe
+
+    if _dataframe is None:
+        with _dataframe_lock:
+            if _dataframe is None:
+                with span("data_load"):
+                    df = load_shared_dataframe() if SHARED_MODE else build_dataframe()
+                    _dataframe = make_read_only(df)
+
+    return _dataframe.copy(deep=False)
+
+
+def build_dataframe():
+    """The cleaned dataset, in its compact form when COMPACT_MODE is set."""
+    df = load_dataframe()
+    if COMPACT_MODE:
+        compact_df = compact_dataframe(df)
+        print(f"Compact dataset: {deep_memory_usage(df) / 1e6:.2f} MB -> {deep_memory_usage(compact_df) / 1e6:.2f} MB")
+        df = compact_df
+
+    return df
+
+
+def load_shared_dataframe():
+    """
+    Returns the dataset backed by the memory-mapped Arrow IPC file of the
+    current source, which the first process to need it writes.
+
+    Numeric columns are zero-copy, read-only views of the mapped file; only
+    the string columns are converted to per-process Python objects.
+    """
+    shared_file_path = get_shared_file_path(get_csv_path())
+    if not os.path.exists(shared_file_path):
+        write_shared(build_dataframe(), shared_file_path)
+
+    with pa.memory_map(shared_file_path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    # split_blocks keeps one block per column instead of copying them into 2D blocks
+    return table.to_pandas(split_blocks=True)
+
+
+def load_dataframe():
+    csv_file_path = get_csv_path()
+    cache_file_path = get_cache_file_path(csv_file_path)
+
+    if os.path.exists(cache_file_path):
+        return pd.read_parquet(cache_file_path)
+
+    df = clean_dataframe(read_source_csv(csv_file_path))
+    write_cache(df, cache_file_path)
+
+    return df
+
+
+def compact_dataframe(df):
+    """
+    Returns `df` with categorical state and county columns, float32
+    percentages and fractions, and each vote count and population column in
+    the narrowest integer type that holds its values.
+    """
+    fraction_columns = [
+        *PERCENTAGE_COLUMNS,
+        *(column for column, kind in COLUMN_SPECS.items() if kind == PERCENT_STRING),
+        *df.filter(regex=PERCENT_0_100_PATTERN).columns,
+        "Gini Index",
+    ]
+    integer_columns = [*VOTE_COLUMNS, "Total Population"]
+
+    return df.assign(
+        state=df["state"].astype("category"),
+        county=df["county"].astype("category"),
+        **{column: df[column].astype("float32") for column in fraction_columns},
+        **{column: pd.to_numeric(df[column], downcast="integer") for column in integer_columns},
+    )
+
+
+def deep_memory_usage(df):
+    """
+    The memory_usage(deep=True) of `df` in bytes. Pandas cannot measure
+    read-only object arrays, so those columns are measured on a copy.
+    """
+    total = df.index.memory_usage(deep=True)
+    for column in df.columns:
+        series = df[column].copy() if df[column].dtype == object else df[column]
+        total += series.memory_usage(index=False, deep=True)
+
+    return total
+
+
+def make_read_only(df):
+    columns = {}
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            codes = df[column].cat.codes.to_numpy()
+            codes.flags.writeable = False
+            columns[column] = pd.Categorical.from_codes(codes, dtype=df[column].dtype)
+        else:
+            values = df[column].to_numpy()
+            values.flags.writeable = False
+            columns[column] = values
+
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def get_csv_path():
+    """
+    Returns the path of the source CSV, only asking kagglehub to resolve the
+    download when the last resolved path is no longer available on disk.
+    """
+    pointer_path = os.path.join(CACHE_DIR, SOURCE_POINTER_FILE)
+
+    if os.path.exists(pointer_path):
+        with open(pointer_path, "r") as file:
+            csv_file_path = file.read().strip()
+        if os.path.exists(csv_file_path):
+            return csv_file_path
+
     path = kagglehub.dataset_download("essarabi/ultimate-us-election-dataset")
     print("Path to dataset files:", path)
-    csv_file_path = os.path.join(path, "US_Election_dataset_v1.csv")
-    if os.path.exists(csv_file_path):
-        df = pd.read_csv(csv_file_path)
-    else:
-        print(f"Error: CSV file not found at {csv_file_path}")
-
-    df = df.drop("Unnamed: 0", axis=1)
-
-    percentages_as_strings = [
-        'Population with less than 9th grade education',
-        'Population with 9th to 12th grade education, no diploma',
-        'High School graduate and equivalent',
-        'Some College,No Degree',
-        'Associates Degree',
-        'Bachelors Degree',
-        'Graduate or professional degree'
-    ]
+    csv_file_path = os.path.join(path, CSV_FILE_NAME)
+    if not os.path.exists(csv_file_path):
+        raise FileNotFoundError(f"Error: CSV file not found at {csv_file_path}")
 
-    df[percentages_as_strings] = df[percentages_as_strings].apply(lambda x: x.str.replace('%', '').astype('float64')/100)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(pointer_path, "w") as file:
+        file.write(csv_file_path)
 
-    df.rename(columns={'Mean income (dollars)': 'x'}, inplace=True)
-    df['Mean income (dollars)'] = df['x'].apply(lambda x: x.replace('$', '').replace(',', '')).astype(int)
-    df.drop(columns=['x'], inplace=True)
+    return csv_file_path
 
-    df.rename(columns={'Median income (dollars)': 'x'}, inplace=True)
-    df['Median income (dollars)'] = df['x'].apply(
-        lambda x: int(x.replace('$', '').replace(',', '')) if x.replace('$', '').replace(',', '').lstrip('-').isdigit() else None
-    )
-    df.drop(columns=['x'], inplace=True)
 
-    out_of_scale_percentages = df.filter(regex='Percentage|percentage|%').columns
+def get_cache_key(csv_file_path):
+    digest = hashlib.sha256()
+    # The FIPS table is an input of the cleaning as well.
+    for file_path in (csv_file_path, FIPS_CSV_PATH):
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+    digest.update(f"cleaning-v{CLEANING_VERSION}".encode())
 
-    df[out_of_scale_percentages] = df[out_of_scale_percentages].apply(lambda x: x / 100 if x.max() > 1 else x)
-    df[out_of_scale_percentages].head()
+    return digest.hexdigest()[:16]
 
-    df["state"] = df["state"].apply(format_state_name)
 
-    return df
+def get_cache_file_path(csv_file_path):
+    name = os.path.splitext(os.path.basename(csv_file_path))[0]
+    return os.path.join(CACHE_DIR, f"{name}-{get_cache_key(csv_file_path)}.parquet")
+
+
+def get_shared_file_path(csv_file_path):
+    name = os.path.splitext(os.path.basename(csv_file_path))[0]
+    variant = "compact" if COMPACT_MODE else "full"
+    return os.path.join(SHARED_DIR, f"{name}-{get_cache_key(csv_file_path)}-{variant}.arrow")
+
+
+def write_shared(df, shared_file_path):
+    os.makedirs(SHARED_DIR, exist_ok=True)
+
+    # Arrow stores the NaN of float columns as nulls by default, which
+    # to_pandas would then have to fill in a copy, so they are kept as values.
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for index, column in enumerate(df.columns):
+        if df[column].dtype.kind == "f":
+            table = table.set_column(index, column, pa.array(df[column].to_numpy(), from_pandas=False))
+
+    tmp_file_path = f"{shared_file_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_file_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_file_path, shared_file_path)
+
+
+def write_cache(df, cache_file_path):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    # Writes to a temporary file first so a concurrent reader never sees a
+    # partially written parquet file.
+    tmp_file_path = f"{cache_file_path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_file_path, index=False)
+    os.replace(tmp_file_path, cache_file_path)
+
+
+CURRENCY = "currency"
+PERCENT_STRING = "percent-string"
+PERCENT_0_100 = "percent-0-100"
+STATE_NAME = "state-name"
+
+COLUMN_SPECS = {
+    'state': STATE_NAME,
+    'Population with less than 9th grade education': PERCENT_STRING,
+    'Population with 9th to 12th grade education, no diploma': PERCENT_STRING,
+    'High School graduate and equivalent': PERCENT_STRING,
+    'Some College,No Degree': PERCENT_STRING,
+    'Associates Degree': PERCENT_STRING,
+    'Bachelors Degree': PERCENT_STRING,
+    'Graduate or professional degree': PERCENT_STRING,
+    'Mean income (dollars)': CURRENCY,
+    'Median income (dollars)': CURRENCY,
+}
+
+# Numeric percentage columns are not listed one by one: every column whose
+# name matches this pattern is rescaled to 0-1 when it is stored as 0-100.
+PERCENT_0_100_PATTERN = 'Percentage|percentage|%'
+
+READ_CSV_DTYPES = {
+    'state': str,
+    'county': str,
+    **{column: 'string[pyarrow]' for column, kind in COLUMN_SPECS.items() if kind in (CURRENCY, PERCENT_STRING)},
+    '2020 Democrat vote raw': 'int64',
+    '2020 Republican vote raw': 'int64',
+    '2020 other vote raw': 'int64',
+    '2020 Democrat vote %': 'float64',
+    '2020 Republican vote %': 'float64',
+    '2020 other vote %': 'float64',
+    'Total Population': 'int64',
+    'Gini Index': 'float64',
+}
+
+
+def read_source_csv(csv_file_path):
+    # The first column of the CSV is an unnamed row number, so it is read as the
+    # index and dropped when the frame is cleaned.
+    return pd.read_csv(csv_file_path, dtype=READ_CSV_DTYPES, index_col=0, engine="pyarrow")
+
+
+def clean_dataframe(df):
+    df = df.reset_index(drop=True)
+
+    specs = dict(COLUMN_SPECS)
+    for column in df.filter(regex=PERCENT_0_100_PATTERN).columns:
+        specs.setdefault(column, PERCENT_0_100)
+
+    cleaned = {column: COLUMN_CLEANERS[kind](df[column]) for column, kind in specs.items()}
+    df = df.assign(**cleaned)
+
+    df["fips"] = get_fips_resolver().resolve_many(df["state"], df["county"])
+    df["winner_party"] = classify_winner(df[VOTE_COLUMNS])
+
+    # The counties of each state are kept contiguous, so that selecting a
+    # state is a slice of the rows (see the "state_offsets" derived table)
+    return df.sort_values("state", kind="stable", ignore_index=True)
+
+
+def clean_currency(column):
+    values = pa.array(column, type=pa.string(), from_pandas=True)
+    values = pc.replace_substring(pc.replace_substring(values, '$', ''), ',', '')
+
+    # Entries such as "-" are not amounts and become missing values.
+    is_amount = pc.utf8_is_digit(pc.utf8_ltrim(values, '-'))
+    values = pc.cast(pc.if_else(is_amount, values, pa.scalar(None, pa.string())), pa.int64())
+
+    # Integer columns without missing values stay int64, as the mean income
+    # column always is; columns with missing values become float64 with NaN.
+    return pd.Series(values.to_numpy(zero_copy_only=False), index=column.index, name=column.name)
+
+
+def clean_percent_string(column):
+    values = pa.array(column, type=pa.string(), from_pandas=True)
+    values = pc.cast(pc.replace_substring(values, '%', ''), pa.float64())
+
+    return pd.Series(values.to_numpy(zero_copy_only=False), index=column.index, name=column.name) / 100
+
+
+def clean_percent_0_100(column):
+    return column / 100 if column.max() > 1 else column
+
+
+def clean_state_name(column):
+    # There are only a few dozen distinct states, so the names are fixed once
+    # per distinct value and broadcast back to every row.
+    codes, names = pd.factorize(column)
+    names = pd.Series(names).replace("DistrictofColumbia", "District of Columbia").str.replace(
+        r'([a-z])([A-Z])', r'\1 \2', regex=True
+    )
 
-def format_state_name(state_name):
-    if state_name == "DistrictofColumbia":
-        return "District of Columbia"
+    return pd.Series(names.to_numpy(dtype=object)[codes], index=column.index, name=column.name)
 
-    return re.sub(r'([a-z])([A-Z])', r'\1 \2', state_name)
 
-get_dataframe()
\ No newline at end of file
+COLUMN_CLEANERS = {
+    CURRENCY: clean_currency,
+    PERCENT_STRING: clean_percent_string,
+    PERCENT_0_100: clean_percent_0_100,
+    STATE_NAME: clean_state_name,
+}
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from helpers.lazy_import import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+FIT_COLUMNS = ["slope", "intercept", "r_squared", "n", "x_mean", "x_sum_squares", "residual_std", "x_min", "x_max"]
+
+
+def fit_lines(x, y):
+    """
+    Fits the least squares line y = slope * x + intercept for every column of
+    `x` against `y`, with closed-form sums instead of a statsmodels OLS model.
+
+    As in trendline="ols", rows where x or y is missing are ignored. Columns
+    with fewer than three rows or a constant x get NaN.
+
+    Returns:
+        A DataFrame indexed by the columns of `x`, with the FIT_COLUMNS that
+        confidence_band needs to draw the line and its band.
+    """
+    columns = list(x.columns)
+    x = x.to_numpy(dtype="float64")
+    y = np.asarray(y, dtype="float64")[:, None]
+
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    n = valid.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = np.where(valid, x, 0.0).sum(axis=0) / n
+        y_mean = np.where(valid, y, 0.0).sum(axis=0) / n
+
+        dx = np.where(valid, x - x_mean, 0.0)
+        dy = np.where(valid, y - y_mean, 0.0)
+        sxx = (dx * dx).sum(axis=0)
+        syy = (dy * dy).sum(axis=0)
+        sxy = (dx * dy).sum(axis=0)
+
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        residual_sum_squares = syy - slope * sxy
+        r_squared = 1 - residual_sum_squares / syy
+        residual_std = np.sqrt(np.maximum(residual_sum_squares, 0) / (n - 2))
+
+    fits = pd.DataFrame({
+        "slope": slope,
+        "intercept": intercept,
+        "r_squared": r_squared,
+        "n": n,
+        "x_mean": x_mean,
+        "x_sum_squares": sxx,
+        "residual_std": residual_std,
+        "x_min": np.where(valid, x, np.inf).min(axis=0),
+        "x_max": np.where(valid, x, -np.inf).max(axis=0),
+    }, index=pd.Index(columns))
+
+    fits.loc[(n < 3) | ~(sxx > 0), ["slope", "intercept", "r_squared", "residual_std"]] = np.nan
+    return fits
+
+
+def confidence_band(fit, x, level=0.95):
+    """
+    Returns the fitted values of `fit` (a row of fit_lines) at `x` and the
+    lower and upper bounds of the `level` confidence interval of the mean.
+    """
+    x = np.asarray(x, dtype="float64")
+    fitted = fit["slope"] * x + fit["intercept"]
+
+    quantile = stats.t.ppf((1 + level) / 2, fit["n"] - 2)
+    margin = quantile * fit["residual_std"] * np.sqrt(1 / fit["n"] + (x - fit["x_mean"]) ** 2 / fit["x_sum_squares"])
+
+    return fitted, fitted - margin, fitted + margin
@@ -0,0 +1,222 @@
+"""
+Simplification of the map boundaries that keeps neighbouring shapes aligned.
+
+As TopoJSON does, the polygons are quantized to an integer grid and split
+into arcs at the junctions where more than two boundaries meet, so that a
+border shared by two counties is a single arc. Every arc is simplified once
+with the Douglas-Peucker algorithm, keeping its end points, and the rings
+are rebuilt from the simplified arcs: shared borders stay identical on both
+sides, without gaps or overlaps, and every junction stays in place.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+# Grid step of the quantized coordinates, in degrees. The bundled boundaries
+# have four decimals, so quantizing them is exact.
+QUANTUM = 1e-4
+
+
+class Topology:
+    """
+    The features of a GeoJSON FeatureCollection as rings of shared arcs.
+
+    Attributes:
+        arcs: The distinct arcs, as (points, 2) arrays of grid coordinates.
+        features: For each feature, its polygons as lists of rings, and each
+            ring as a list of (arc index, reversed) pairs.
+    """
+
+    def __init__(self, geojson: dict):
+        self.geojson = geojson
+        rings = [
+            [[quantize(ring) for ring in polygon] for polygon in get_polygons(feature["geometry"])]
+            for feature in geojson["features"]
+        ]
+        junctions = find_junctions([ring for polygons in rings for polygon in polygons for ring in polygon])
+
+        self.arcs: List[np.ndarray] = []
+        self._arc_keys: Dict[bytes, int] = {}
+        self.features = [
+            [[self._add_ring(ring, junctions) for ring in polygon] for polygon in polygons]
+            for polygons in rings
+        ]
+
+    def _add_ring(self, ring, junctions):
+        """Splits `ring` at its junctions and returns its arcs, adding the new ones."""
+        is_junction = np.isin(point_keys(ring), junctions)
+        cuts = np.flatnonzero(is_junction)
+
+        if len(cuts) == 0:
+            # A ring without junctions is one closed arc, started at its lowest point so that
+            # the same ring of two features is found equal
+            start = np.lexsort((ring[:, 1], ring[:, 0]))[0]
+            pieces = [np.concatenate([ring[start:], ring[:start + 1]])]
+        else:
+            rotated = np.concatenate([ring[cuts[0]:], ring[:cuts[0]]])
+            bounds = [*(cuts - cuts[0]), len(ring)]
+            pieces = [
+                np.concatenate([rotated[start:stop], rotated[stop % len(ring)][None]])
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+
+        return [self._add_arc(piece) for piece in pieces]
+
+    def _add_arc(self, points):
+        forward = points.tobytes()
+        backward = points[::-1].copy().tobytes()
+
+        if forward in self._arc_keys:
+            return self._arc_keys[forward], False
+        if backward in self._arc_keys:
+            return self._arc_keys[backward], True
+
+        self._arc_keys[forward] = len(self.arcs)
+        self.arcs.append(points)
+        return len(self.arcs) - 1, False
+
+    def to_geojson(self, tolerance: float, properties=()) -> dict:
+        """
+        Returns the features simplified with `tolerance` (in degrees), with
+        the coordinates rounded to the precision that tolerance needs and
+        only the `properties` listed.
+        """
+        tolerance_steps = tolerance / QUANTUM
+        arcs = [arc[simplify(arc, tolerance_steps)] for arc in self.arcs]
+
+        # Rings whose arcs were all reduced to their end points would be flat; their
+        # arcs keep their farthest interior point, on both sides of the shared borders
+        flat_arcs = {
+            index
+            for polygons in self.features for polygon in polygons for ring in polygon
+            if sum(len(arcs[index]) - 1 for index, _ in ring) < 3
+            for index, _ in ring
+        }
+        for index in flat_arcs:
+            arc = self.arcs[index]
+            arcs[index] = arc[simplify(arc, tolerance_steps, forced_levels=1)]
+
+        # A tenth of the tolerance is below what the simplification already moved the points
+        decimals = min(4, max(0, int(np.ceil(-np.log10(tolerance / 10)))))
+
+        features = []
+        for feature, polygons in zip(self.geojson["features"], self.features):
+            coordinates = [
+                [ring_coordinates(arcs, ring, decimals) for ring in polygon]
+                for polygon in polygons
+            ]
+            coordinates = [polygon for polygon in coordinates if polygon[0] is not None]
+            coordinates = [[ring for ring in polygon if ring is not None] for polygon in coordinates]
+
+            geometry = {"type": "MultiPolygon", "coordinates": coordinates}
+            if len(coordinates) == 1:
+                geometry = {"type": "Polygon", "coordinates": coordinates[0]}
+
+            features.append({
+                **{key: feature[key] for key in ("type", "id") if key in feature},
+                "properties": {key: feature["properties"][key] for key in properties},
+                "geometry": geometry,
+            })
+
+        return {"type": "FeatureCollection", "features": features}
+
+
+def get_polygons(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    return geometry["coordinates"]
+
+
+def quantize(ring):
+    """The points of a GeoJSON ring on the integer grid, without the closing point and repeated points."""
+    points = np.rint(np.asarray(ring, dtype="float64") / QUANTUM).astype("int64")
+    if len(points) > 1 and (points[0] == points[-1]).all():
+        points = points[:-1]
+
+    keep = np.r_[True, (np.diff(points, axis=0) != 0).any(axis=1)]
+    return points[keep]
+
+
+def point_keys(points):
+    # Quantized longitudes and latitudes are well within 32 bits
+    return (points[:, 0] << 32) + (points[:, 1] & 0xFFFFFFFF)
+
+
+def find_junctions(rings):
+    """
+    The keys of the points that have more than two distinct neighbours over
+    all rings: the points where a shared border starts or ends.
+    """
+    keys = np.concatenate([point_keys(ring) for ring in rings])
+    next_keys = np.concatenate([point_keys(np.roll(ring, -1, axis=0)) for ring in rings])
+
+    pairs = np.unique(np.stack([np.r_[keys, next_keys], np.r_[next_keys, keys]], axis=1), axis=0)
+    points, neighbour_counts = np.unique(pairs[:, 0], return_counts=True)
+
+    return points[neighbour_counts > 2]
+
+
+def simplify(points, tolerance, forced_levels=0):
+    """
+    The mask of the points of the polyline `points` kept by the
+    Douglas-Peucker algorithm with `tolerance`. The end points are always
+    kept, and the first `forced_levels` levels of splits are made whatever
+    the tolerance: two for a closed arc, so that a ring made of a single arc
+    keeps at least three distinct points.
+    """
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    if len(points) <= 2:
+        return keep
+
+    if (points[0] == points[-1]).all():
+        forced_levels = max(forced_levels, 2)
+
+    stack = [(0, len(points) - 1, forced_levels)]
+    while stack:
+        start, stop, forced = stack.pop()
+        if stop - start < 2:
+            continue
+
+        distances = segment_distances(points[start + 1:stop], points[start], points[stop])
+        farthest = int(np.argmax(distances))
+        if forced > 0 or distances[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split, forced - 1))
+            stack.append((split, stop, forced - 1))
+
+    return keep
+
+
+def segment_distances(points, start, stop):
+    """The distance of each point to the segment from `start` to `stop`."""
+    direction = (stop - start).astype("float64")
+    offsets = (points - start).astype("float64")
+    length = direction @ direction
+
+    if length == 0:
+        return np.hypot(offsets[:, 0], offsets[:, 1])
+
+    t = np.clip(offsets @ direction / length, 0, 1)
+    return np.hypot(*(offsets - t[:, None] * direction).T)
+
+
+def ring_coordinates(arcs, ring, decimals):
+    """
+    The coordinates of a ring of arcs as a (points, 2) array, or None when it
+    is too small to draw. Plotly copies a figure's geojson several times, and
+    copying one array per ring is much cheaper than nested lists of points.
+    """
+    pieces = [arcs[index][::-1] if reverse else arcs[index] for index, reverse in ring]
+    points = np.concatenate([pieces[0], *(piece[1:] for piece in pieces[1:])])
+
+    coordinates = np.round(points * QUANTUM, decimals)
+    keep = np.r_[True, (np.diff(coordinates, axis=0) != 0).any(axis=1)]
+    coordinates = coordinates[keep]
+
+    # A closed ring needs at least three distinct points
+    if len(coordinates) < 4:
+        return None
+
+    return coordinates
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+DEMOCRATS = "Democrats"
+REPUBLICANS = "Republicans"
+OTHERS = "Others"
+TIE = "Tie"
+
+PARTIES = [DEMOCRATS, REPUBLICANS, OTHERS]
+
+VOTE_COLUMNS = ["2020 Democrat vote raw", "2020 Republican vote raw", "2020 other vote raw"]
+PERCENTAGE_COLUMNS = ["2020 Democrat vote %", "2020 Republican vote %", "2020 other vote %"]
+
+
+def classify_winner(votes, parties=PARTIES, tie_label=TIE):
+    """
+    Returns the winning party of each row of `votes`.
+
+    Args:
+        votes: 2D array-like with one row per location and one column per
+            party, in the order of `parties`. Raw vote counts and vote
+            percentages give the same result.
+        parties: The party names of the columns of `votes`.
+        tie_label: The label of rows where two or more parties share the
+            highest value.
+
+    Returns:
+        A Categorical with the categories `parties` followed by `tie_label`.
+        Rows without any value are missing.
+    """
+    values = np.asarray(votes, dtype="float64")
+
+    is_missing = np.isnan(values)
+    values = np.where(is_missing, -np.inf, values)
+
+    winners = values.argmax(axis=1)
+    highest = values[np.arange(len(values)), winners]
+    is_tie = (values == highest[:, None]).sum(axis=1) > 1
+
+    codes = np.where(is_tie, len(parties), winners)
+    codes[is_missing.all(axis=1)] = -1
+
+    return pd.Categorical.from_codes(codes, categories=[*parties, tie_label])
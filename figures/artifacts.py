@@ -0,0 +1,101 @@
+"""
+Figures of the pages precomputed by `python -m figures.precompute`.
+
+Every figure a page can show is built by a function registered with
+@variants, together with the values each of its widgets can take. The
+precompute job builds every combination and stores plotly figures as JSON
+and matplotlib figures as PNG under ARTIFACT_ROOT, in a directory named
+after the dataset cache key and ARTIFACT_VERSION. A new dataset, or a
+change to the figures that bumps ARTIFACT_VERSION, therefore never serves
+stale artifacts.
+
+Pages call get_figure and get_png, which read the artifact when it exists
+and build the figure live otherwise.
+"""
+import os
+import threading
+from typing import Callable
+from urllib.parse import quote
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from dataset.get_dataset import get_cache_key, get_csv_path
+from helpers.figure_cache import figure_cache
+from helpers.timing import span
+
+# Bump this whenever a registered figure changes, so that older artifacts are ignored.
+ARTIFACT_VERSION = 3
+
+ARTIFACT_ROOT = os.environ.get(
+    "DASHBOARD_ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts"),
+)
+
+MANIFEST_FILE = "manifest.json"
+
+# (page, figure name, build function, {parameter: values or a function returning them})
+VARIANTS = []
+
+_artifact_dir = None
+_artifact_dir_lock = threading.Lock()
+
+
+def variants(page, name, **grid):
+    """
+    Registers the decorated function as the builder of figure `name` of
+    `page`. Each keyword lists the values of one parameter (or is a function
+    returning them), and the precompute job builds every combination.
+    """
+    def register(function):
+        VARIANTS.append((page, name, function, grid))
+        return function
+
+    return register
+
+
+def get_artifact_dir():
+    """The artifact directory of the current dataset, resolved once per process."""
+    global _artifact_dir
+
+    if _artifact_dir is None:
+        with _artifact_dir_lock:
+            if _artifact_dir is None:
+                dataset_key = get_cache_key(get_csv_path())
+                _artifact_dir = os.path.join(ARTIFACT_ROOT, f"{dataset_key}-v{ARTIFACT_VERSION}")
+
+    return _artifact_dir
+
+
+def format_value(value):
+    return str(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+def artifact_path(page, name, params, extension, artifact_dir=None):
+    file_name = "__".join(f"{key}={format_value(value)}" for key, value in sorted(params.items())) or "default"
+    return os.path.join(artifact_dir or get_artifact_dir(), page, name, quote(file_name, safe="=_-.,") + extension)
+
+
+def get_figure(page, name, build: Callable[..., go.Figure], **params) -> go.Figure:
+    """Returns the precomputed plotly figure `name` of `page` for `params`, or builds it."""
+    path = artifact_path(page, name, params, ".json")
+    if os.path.exists(path):
+        with span("figure", page=page, figure=name, source="artifact"), open(path, "r") as file:
+            return pio.from_json(file.read())
+
+    with span("figure", page=page, figure=name, source="live"):
+        return build(**params)
+
+
+def get_png(page, name, build: Callable, **params) -> bytes:
+    """
+    Returns the precomputed PNG of the matplotlib figure `name` of `page` for
+    `params`, or renders it through the shared figure cache.
+    """
+    path = artifact_path(page, name, params, ".png")
+    if os.path.exists(path):
+        with span("figure", page=page, figure=name, source="artifact"), open(path, "rb") as file:
+            return file.read()
+
+    with span("figure", page=page, figure=name, source="live"):
+        return figure_cache.get_or_render((page, name, tuple(sorted(params.items()))), lambda: build(**params))
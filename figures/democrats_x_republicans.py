@@ -0,0 +1,163 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from dataset.derived import get_derived
+from dataset.geometry import get_map_geojson, FEATURE_ID_KEYS, STATES, COUNTIES
+from figures.artifacts import variants
+
+PAGE = "Democrats_x_Republicans"
+
+PARTIES_TO_SHOW = ["Both", "Democrats", "Republicans"]
+LEVELS = ["by state", "by county"]
+
+republican_color = "#F2545B"
+democrat_color = "#216681"
+not_selected_color = "#D3D3D3"
+
+MAP_CENTER = {"lat": 37.0902, "lon": -95.7129}
+MAP_ZOOM = 2.5
+
+
+def get_color_map(party_to_show):
+    if party_to_show == "Both":
+        return {"Republicans": republican_color, "Democrats": democrat_color}
+    elif party_to_show == "Democrats":
+        return {"Republicans": not_selected_color, "Democrats": democrat_color}
+    else:
+        return {"Republicans": republican_color, "Democrats": not_selected_color}
+
+
+def get_map_df(city_or_state):
+    if city_or_state == "by state":
+        return get_derived("state_votes")
+    else:  # by county
+        return get_derived("county_votes")
+
+
+@variants(PAGE, "map", party_to_show=PARTIES_TO_SHOW, city_or_state=LEVELS)
+def map_figure(party_to_show, city_or_state):
+    #preparing df for the map plot
+    if city_or_state == "by state":
+        geo_level = STATES
+        field_name = "state"
+    else: #by county
+        geo_level = COUNTIES
+        field_name = "fips"
+
+    map_plot = px.choropleth_map(
+        data_frame=get_map_df(city_or_state),
+        geojson=get_map_geojson(geo_level, MAP_ZOOM, ids=[]),
+        color="winner_party",
+        labels={"winner_party": "winner party"},
+        locations=field_name, featureidkey=FEATURE_ID_KEYS[geo_level],
+        center=MAP_CENTER,
+        zoom=MAP_ZOOM,
+        color_discrete_map=get_color_map(party_to_show)
+    )
+
+    # o px repetiria o geojson inteiro em cada trace (um por partido); cada um leva só as suas regiões
+    for trace in map_plot.data:
+        trace.geojson = get_map_geojson(geo_level, MAP_ZOOM, ids=trace.locations)
+
+    return map_plot
+
+
+@variants(PAGE, "bar", party_to_show=PARTIES_TO_SHOW, city_or_state=LEVELS)
+def bar_figure(party_to_show, city_or_state):
+    map_df = get_map_df(city_or_state)
+
+    #preparing df for the barplot
+    counts = map_df["winner_party"].value_counts()
+    counts = counts[counts > 0]
+    counts_df = pd.DataFrame(counts).transpose()
+    counts_df = counts_df.melt(var_name="Party", value_name="Count")
+
+    if party_to_show != "Both":
+        counts_df = counts_df[counts_df["Party"] == party_to_show]
+
+    bar_plot = px.bar(
+        counts_df,
+        x="Party",
+        y="Count",
+        color="Party",
+        color_discrete_map=get_color_map(party_to_show),
+        text="Count"
+    )
+
+    location = city_or_state.split(" ")[1]
+
+    bar_plot.update_layout(
+        title=f"Count of {location}",
+        xaxis_title="Party",
+        yaxis_title="Count",
+        yaxis_range=[0, len(map_df)],
+        showlegend=False
+    )
+    bar_plot.update_traces(textposition='outside', textfont=dict(size=16))
+
+    return bar_plot
+
+
+@variants(PAGE, "histogram", party_to_show=PARTIES_TO_SHOW, city_or_state=LEVELS)
+def histogram_figure(party_to_show, city_or_state):
+    hist_df = get_map_df(city_or_state)
+
+    opacity = 0.75
+    bar_size = 0.05
+
+    hist1 = go.Histogram(
+        x=hist_df["democrat_percentage"],
+        opacity=opacity,
+        marker=dict(color=democrat_color),
+        name='Democrats',
+        xbins=dict(size=bar_size),
+        autobinx=False
+    )
+
+    hist2 = go.Histogram(
+        x=hist_df["republican_percentage"],
+        opacity=opacity,
+        marker=dict(color=republican_color),
+        name='Republicans',
+        xbins=dict(size=bar_size),
+        autobinx=False
+    )
+
+    if party_to_show == "Both":
+        hist2.update(yaxis='y2')
+        layout = go.Layout(
+            title='Democrats x Republicans',
+            xaxis=dict(title='Value'),
+            yaxis=dict(title='Count', showgrid=True),
+            yaxis2=dict(title='Count', overlaying='y', side='right', showgrid=False),
+            barmode='overlay',
+            bargap=0.2,
+            showlegend=True
+        )
+
+        return go.Figure(data=[hist1, hist2], layout=layout)
+
+    elif party_to_show == "Democrats":
+        layout = go.Layout(
+            title='Democrats',
+            xaxis=dict(title='Value'),
+            yaxis=dict(title='Count', showgrid=True),
+            barmode='overlay',
+            bargap=0.2,
+            showlegend=True
+        )
+
+        return go.Figure(data=[hist1], layout=layout)
+
+    else:
+        layout = go.Layout(
+            title='Republicans',
+            xaxis=dict(title='Value'),
+            yaxis=dict(title='Count', showgrid=True),
+            barmode='overlay',
+            bargap=0.2,
+            showlegend=True
+        )
+
+        return go.Figure(data=[hist2], layout=layout)
@@ -0,0 +1,152 @@
+import plotly.express as px
+import plotly.graph_objects as go
+import pandas as pd
+
+from dataset.bootstrap import CONFIDENCE_LEVEL, METHOD_NAMES, METHODS, PEARSON, format_interval
+from dataset.derived import ALL_STATES, get_correlation_interval, get_derived, get_states
+from dataset.get_dataset import get_dataframe
+from figures.artifacts import variants
+from helpers.scatter_plot import scatter
+
+PAGE = "Education_level_x_Party"
+
+education_level_options = {
+    'Population with less than 9th grade education': 'Até a 9ª série',
+    'Population with 9th to 12th grade education, no diploma': '9ª a 12ª série, sem diploma',
+    'High School graduate and equivalent': 'Ensino Médio completo',
+    'Some College,No Degree': 'Ensino Superior incompleto',
+    'Associates Degree': 'Associates Degree',
+    'Bachelors Degree': 'Bacharelado',
+    'Graduate or professional degree': 'Pós-graduação',
+}
+
+PLOT_SIZES = ['Total Population', 'Hispanic or Latino percentage', 'Mean income (dollars)']
+
+
+def scatter_figures(education_level, plot_size):
+    df = get_dataframe()
+
+    # Gráfico de dispersão para votos republicanos
+    fig1 = scatter(
+        df,
+        x=education_level,
+        y='2020 Republican vote %',
+        color='state',
+        size=plot_size,
+        hover_name='county',
+        size_max=60,
+        title=f'Porcentagem de votos republicanos pela porcentagem da população no nível {education_level_options[education_level]}',
+        labels={
+            education_level: f'Porcentagem da população com nível de educação {education_level_options[education_level]}',
+            '2020 Republican vote %': 'Porcentagem de votos republicanos',
+        },
+    )
+
+    # Gráfico de dispersão para votos democratas
+    fig2 = scatter(
+        df,
+        x=education_level,
+        y='2020 Democrat vote %',
+        color='state',
+        size=plot_size,
+        hover_name='county',
+        size_max=60,
+        title=f'Porcentagem de votos democratas pela porcentagem da população no nível {education_level_options[education_level]}',
+        labels={
+            education_level: f'Porcentagem da população com nível de educação {education_level_options[education_level]}',
+            '2020 Democrat vote %': 'Porcentagem de votos democratas',
+        },
+    )
+
+    # Encontrando o valor máximo do eixo y em ambos os gráficos
+    max_y_value = df[['2020 Republican vote %', '2020 Democrat vote %']].max().max()
+
+    fig1.update_yaxes(range=[0, max_y_value * 1.1])
+    fig2.update_yaxes(range=[0, max_y_value * 1.1])
+
+    return fig1, fig2
+
+
+@variants(PAGE, "republican_scatter", education_level=list(education_level_options), plot_size=PLOT_SIZES)
+def republican_scatter_figure(education_level, plot_size):
+    return scatter_figures(education_level, plot_size)[0]
+
+
+@variants(PAGE, "democrat_scatter", education_level=list(education_level_options), plot_size=PLOT_SIZES)
+def democrat_scatter_figure(education_level, plot_size):
+    return scatter_figures(education_level, plot_size)[1]
+
+
+@variants(PAGE, "heatmap", method=METHODS)
+def heatmap_figure(method=PEARSON):
+    # Correlação de cada nível de educação com os votos, com o intervalo de confiança bootstrap de cada célula
+    intervals = [
+        [
+            get_correlation_interval(ALL_STATES, education_level, party_column, method)
+            for party_column in ['2020 Republican vote %', '2020 Democrat vote %']
+        ]
+        for education_level in education_level_options.keys()
+    ]
+
+    # Define o intervalo da escala de cores como -1 a 1
+    # O texto de cada célula vem do próprio go.Heatmap: o plotly.figure_factory importa o SciPy inteiro
+    fig3 = go.Figure(go.Heatmap(
+        z=[[interval["estimate"] for interval in row] for row in intervals],
+        text=[[format_interval(interval) for interval in row] for row in intervals],
+        x=['Votos Republicanos', 'Votos Democratas'],
+        y=list(education_level_options.values()),
+        colorscale='inferno',
+        showscale=True,
+        xgap=3,
+        ygap=3,
+        zmin=-1,  # Define o valor mínimo da escala de cores
+        zmax=1,  # Define o valor máximo da escala de cores
+        texttemplate='%{text}',
+    ))
+    fig3.update_xaxes(side='top')
+
+    fig3.update_layout(
+        title_text=f'Correlação ({METHOD_NAMES[method]}) entre Nível de Educação e Partido do Voto, com IC de {CONFIDENCE_LEVEL:.0%}',
+        title_x=0.5,
+        xaxis_showgrid=False,
+        yaxis_showgrid=False,
+        xaxis_zeroline=False,
+        yaxis_zeroline=False,
+        yaxis_autorange='reversed',
+        template='plotly_dark'
+    )
+
+    return fig3
+
+
+def get_edu_means(selected_state_bar):
+    # Médias de cada nível de educação para o estado selecionado, calculadas uma única vez por estado
+    state_means = get_derived("state_means").loc[selected_state_bar]
+    return {key: state_means[key] for key in education_level_options.keys()}
+
+
+@variants(PAGE, "bar", selected_state_bar=get_states)
+def bar_figure(selected_state_bar):
+    edu_means = get_edu_means(selected_state_bar)
+
+    # Cria um DataFrame a partir do dicionário, usando os rótulos customizados
+    edu_df = pd.DataFrame({
+        "Nível de Educação": [education_level_options[key] for key in education_level_options.keys()],
+        "Média (%)": [edu_means[key] for key in education_level_options.keys()]
+    })
+
+    fig_bar = px.bar(
+        edu_df,
+        x="Nível de Educação",
+        y="Média (%)",
+        title=f"Níveis de Educação em {selected_state_bar}",
+        template="plotly_dark"
+    )
+
+    fig_bar.update_layout(
+        xaxis_title="Nível de Educação",
+        yaxis_title="Média (%)",
+        xaxis_tickangle=-45
+    )
+
+    return fig_bar
@@ -0,0 +1,111 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from dataset.correlation import ETHNICITY_COLUMNS
+from dataset.derived import calculate_state_correlation, get_derived, get_ethnicity_vote_trendline
+from dataset.geometry import get_map_geojson, FEATURE_ID_KEYS, STATES
+from figures.artifacts import variants
+from helpers.trendline import add_trendline
+
+PAGE = "Ethnicity_x_Party"
+
+PARTIES = ["Democrats", "Republicans"]
+
+MAP_ZOOM = 3
+
+
+def create_choropleth_map(df, geojson_data, field_name, property_name, color_map):
+    map_plot = px.choropleth_mapbox(
+        data_frame=df,
+        geojson=geojson_data,
+        color="correlation",
+        locations=field_name,
+        featureidkey=property_name,
+        color_continuous_scale=color_map,
+        center={"lat": 37.0902, "lon": -95.7129},
+        zoom=MAP_ZOOM,
+        range_color=(-1, 1),
+        mapbox_style="carto-positron",
+        height=600
+    )
+    
+    map_plot.update_layout(
+        margin={"r": 0, "t": 0, "l": 0, "b": 0},
+        autosize=True
+    )
+    return map_plot
+
+def create_ethnicity_vote_scatter(df, ethnicity_type, party_type, trendline_fit=None):
+    republican_color = "#F2545B"
+    democrat_color = "#216681"
+    not_selected_color = "#D3D3D3"
+    
+    if party_type == 'Democrats':
+        party_column = 'democrat_percentage'
+        point_color = democrat_color  # Cor para Democratas
+    elif party_type == 'Republicans':
+        party_column = 'republican_percentage'
+        point_color = republican_color  # Cor para Republicanos
+    else:
+        party_column = 'other_percentage'
+        point_color = not_selected_color  # Cor para outros (caso exista)
+    
+    if ethnicity_type not in df.columns:
+        st.error(f"A coluna '{ethnicity_type}' não existe no DataFrame.")
+        return None
+    
+    # Criar o gráfico de dispersão
+    scatter_plot = px.scatter(
+        df,
+        x=ethnicity_type,
+        y=party_column,
+        hover_name="state",
+        labels={
+            ethnicity_type: f"Porcentagem de {ethnicity_type}",
+            party_column: f"Porcentagem de Votos {party_type}"
+        },
+        title=f"Relação entre {ethnicity_type} e Votos {party_type}",
+    )
+    
+    # Definir a cor dos pontos manualmente
+    scatter_plot.update_traces(marker=dict(color=point_color))
+
+    # Adicionar a linha de tendência linear, pré-calculada para cada etnia e partido
+    if trendline_fit is not None:
+        add_trendline(scatter_plot, trendline_fit, color=point_color)
+    
+    return scatter_plot
+
+def get_state_filtered_df(ethnicity_type, party_filter):
+    df_state_filtered = get_derived("state_votes")
+
+    if party_filter == "Democrats":
+        df_state_filtered = df_state_filtered[df_state_filtered['winner_party'] == 'Democrats']
+    elif party_filter == "Republicans":
+        df_state_filtered = df_state_filtered[df_state_filtered['winner_party'] == 'Republicans']
+
+    state_correlations = calculate_state_correlation(ethnicity_type, party_filter)
+    df_state_filtered = pd.merge(df_state_filtered, state_correlations, on="state")
+
+    # Adicionar as colunas de etnia ao DataFrame filtrado
+    df_ethnicity = get_derived("state_means")[[ethnicity_type]].reset_index()
+    return pd.merge(df_state_filtered, df_ethnicity, on="state")
+
+
+@variants(PAGE, "map", ethnicity_type=ETHNICITY_COLUMNS, party_filter=PARTIES)
+def map_figure(ethnicity_type, party_filter):
+    # Criar o mapa interativo com o GeoJSON dos estados, simplificado para o zoom e só com os estados do df
+    df = get_state_filtered_df(ethnicity_type, party_filter)
+    return create_choropleth_map(df, get_map_geojson(STATES, MAP_ZOOM, ids=df["state"]),
+                                 field_name="state", property_name=FEATURE_ID_KEYS[STATES], color_map="Viridis")
+
+
+@variants(PAGE, "scatter", ethnicity_type=ETHNICITY_COLUMNS, party_filter=PARTIES, party_scatter=PARTIES)
+def scatter_figure(ethnicity_type, party_filter, party_scatter):
+    return create_ethnicity_vote_scatter(
+        get_state_filtered_df(ethnicity_type, party_filter),
+        ethnicity_type,
+        party_scatter,
+        trendline_fit=get_ethnicity_vote_trendline(party_filter, party_scatter, ethnicity_type),
+    )
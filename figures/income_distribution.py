@@ -0,0 +1,176 @@
+import pandas as pd
+import plotly.express as px
+
+from dataset.derived import ALL_STATES, get_derived, get_mean_income_fit, get_state_rows, get_states, with_columns
+from dataset.get_dataset import get_dataframe
+from figures.artifacts import variants
+from helpers.cdf_plot import CDFPlot
+from helpers.histogram_plot import HistogramPlot
+from helpers.pdf_plot import PDFPlot
+from helpers.violin_summary import summary_violin_figure
+
+PAGE = "Income_Distribution"
+
+# Valores do slider de porcentagem (passo de 0.01). Para cada estado, só os
+# múltiplos de 0.05 são pré-calculados; os demais são desenhados na hora.
+PERCENTILES = [round(step / 100, 2) for step in range(101)]
+STATE_PERCENTILES = [round(step / 20, 2) for step in range(21)]
+
+
+def get_state_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the county rows of `df` with the party each county voted for.
+
+    Args:
+        df: The input DataFrame with county-level data, the dataset or a
+            slice of it.
+
+    Returns:
+        A DataFrame with the columns of `df` and most_voted_party, the party
+        with the most votes in each county.
+    """
+
+    # The most voted party is a derived column: it is attached as a view, without changing the shared dataset
+    return with_columns(df, "most_voted_party")
+
+
+def get_state_violin_df(selected_state_pdf):
+    return get_state_data(get_state_rows(selected_state_pdf))
+
+
+@variants(PAGE, "mean_violin")
+def mean_violin_figure():
+    # Violin plot para Mean Income
+    # Com todos os estados, o gráfico usa os resumos pré-calculados (quartis e
+    # densidade) em vez de enviar todos os condados ao navegador
+    fig_mean = summary_violin_figure(get_derived("mean_income_violins"),
+                                     x_column="state",
+                                     color_column="winner_party",
+                                     color_discrete_map={'Democrats': 'blue',
+                                                         'Republicans': 'red', 'Others': 'gray'},
+                                     )
+    fig_mean.update_layout(
+        title_text="Mean Income by State",
+        yaxis_title="Mean Income (dollars)",
+        xaxis_title="State",
+        legend_title_text="most_voted_party",
+    )
+
+    return fig_mean
+
+
+@variants(PAGE, "median_violin")
+def median_violin_figure():
+    # Violin plot para Median Income (similar ao anterior)
+    fig_median = summary_violin_figure(get_derived("median_income_violins"),
+                                       x_column="state",
+                                       color_column="winner_party",
+                                       color_discrete_map={'Democrats': 'blue',
+                                                           'Republicans': 'red', 'Others': 'gray'},
+                                       )
+    fig_median.update_layout(
+        title_text="Median Income by State",
+        yaxis_title="Median Income (dollars)",
+        xaxis_title="State",
+        legend_title_text="most_voted_party",
+    )
+
+    return fig_median
+
+
+@variants(PAGE, "state_mean_violin", selected_state_pdf=get_states)
+def state_mean_violin_figure(selected_state_pdf):
+    df_state_violin = get_state_violin_df(selected_state_pdf)
+
+    # Violin plot para Mean Income
+    fig_mean = px.violin(df_state_violin,
+                         y="Mean income (dollars)",
+                         x="state",
+                         color="most_voted_party",
+                         box=True,  # Mostra a caixa
+                         points="all",  # Mostra todos os pontos
+                         color_discrete_map={'Democrats': 'blue',
+                                             'Republicans': 'red', 'Others': 'gray'},
+                         )
+
+    fig_mean.update_traces(
+        jitter=0.7,  # Adiciona jitter horizontal aos pontos
+        pointpos=0,  # Posiciona os pontos no centro
+        marker=dict(size=7, opacity=0.7),  # Melhora a visualização dos pontos
+    )
+    fig_mean.update_layout(
+        title_text="Mean Income by State",
+        yaxis_title="Mean Income (dollars)",
+        xaxis_title="State"
+    )
+
+    fig_mean.update_traces(
+        jitter=0.7,
+        pointpos=0,
+        marker=dict(size=7, opacity=0.7),
+        line_width=2.5  # Adicione esta linha para aumentar a espessura da linha da caixa
+    )
+
+    return fig_mean
+
+
+@variants(PAGE, "state_median_violin", selected_state_pdf=get_states)
+def state_median_violin_figure(selected_state_pdf):
+    df_state_violin = get_state_violin_df(selected_state_pdf)
+
+    # Violin plot para Median Income (similar ao anterior)
+    fig_median = px.violin(df_state_violin,
+                           y="Median income (dollars)",
+                           x="state",
+                           color="most_voted_party",
+                           box=True,  # Mostra a caixa
+                           points="all",  # Mostra todos os pontos
+                           color_discrete_map={'Democrats': 'blue',
+                                               'Republicans': 'red', 'Others': 'gray'},
+                           )
+
+    fig_median.update_traces(
+        jitter=0.7,  # Adiciona jitter horizontal aos pontos
+        pointpos=0,  # Posiciona os pontos no centro
+        marker=dict(size=7, opacity=0.7),  # Melhora a visualização dos pontos
+    )
+
+    fig_median.update_layout(
+        title_text="Median Income by State",
+        yaxis_title="Median Income (dollars)",
+        xaxis_title="State",
+    )
+
+    fig_median.update_traces(
+        jitter=0.7,
+        pointpos=0,
+        marker=dict(size=7, opacity=0.7),
+        line_width=2.5  # Adicione esta linha para aumentar a espessura da linha da caixa
+    )
+
+    return fig_median
+
+
+@variants(PAGE, "histogram")
+def histogram_figure():
+    # Plota um histograma da renda média
+    return HistogramPlot().plot(
+        real_data=get_dataframe()['Mean income (dollars)'],
+        title='Histograma da Renda Média',
+        xlabel='Renda Média (dólares)',
+    )
+
+
+@variants(PAGE, "pdf", percentile=PERCENTILES)
+def pdf_figure(percentile):
+    return PDFPlot().plot(desired_percentile=percentile, **get_mean_income_fit(ALL_STATES, percentile))[0]
+
+
+@variants(PAGE, "cdf", percentile=PERCENTILES)
+def cdf_figure(percentile):
+    return CDFPlot().plot(desired_percentile=percentile, **get_mean_income_fit(ALL_STATES, percentile))[0]
+
+
+@variants(PAGE, "state_pdf", selected_state_pdf=get_states, percentile=STATE_PERCENTILES)
+def state_pdf_figure(selected_state_pdf, percentile):
+    return PDFPlot().plot(desired_percentile=percentile, **get_mean_income_fit(selected_state_pdf, percentile))[0]
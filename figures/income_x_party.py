@@ -0,0 +1,107 @@
+import plotly.graph_objects as go
+
+from dataset.bootstrap import CONFIDENCE_LEVEL, METHOD_NAMES, METHODS, PEARSON, format_interval
+from dataset.derived import get_correlation_interval, get_state_rows, get_states
+from dataset.get_dataset import get_dataframe
+from figures.artifacts import variants
+from helpers.scatter_plot import scatter
+
+PAGE = "Income_x_Party"
+
+PARTIES = ["Democrats", "Republicans"]
+FIELDS = ["Gini Index", "Mean income (dollars)", "Median income (dollars)"]
+
+republican_color = "#F2545B"
+democrat_color = "#216681"
+
+
+def get_views():
+    views = get_states()
+    views.insert(0, "All")
+    return views
+
+
+def get_state_df(state):
+    # O dataset é ordenado por estado: os condados de um estado são uma fatia das linhas, sem cópia
+    return get_state_rows(state)
+
+def get_corr_matrix_plot(view, x_field, y_field, method=PEARSON):
+    # Cada correlação vem com o intervalo de confiança bootstrap, calculado uma vez por estado e par de colunas
+    interval = get_correlation_interval(view, x_field, y_field, method)
+    fields = [x_field, y_field]
+
+    z = [[1.0, interval["estimate"]], [interval["estimate"], 1.0]]
+    text = [["1.0", format_interval(interval)], [format_interval(interval), "1.0"]]
+
+    matrix_plot = go.Figure(
+        data=go.Heatmap(
+            z=z,
+            x=fields,
+            y=fields,
+            colorscale='Viridis',
+            showscale=True
+        )
+    )
+    for i in range(len(fields)):
+        for j in range(len(fields)):
+            matrix_plot.add_annotation(
+                go.layout.Annotation(
+                    text=text[i][j],
+                    x=fields[j],
+                    y=fields[i],
+                    showarrow=False,
+                    font=dict(color='white' if z[i][j] < 0.5 else 'black')
+                )
+            )
+    matrix_plot.update_layout(
+        title=f"{x_field} x Party votes ({METHOD_NAMES[method]}, IC {CONFIDENCE_LEVEL:.0%}, n={interval['n']})",
+        xaxis_title=x_field,
+        yaxis_title='Party Votes (percentage)'
+    )
+
+    return matrix_plot
+
+def get_scatter_plot(plot_df, plot_color, x_field, y_field, x_title, y_title, title):
+
+    plot = scatter(
+        plot_df, 
+        x=x_field, 
+        y=y_field, 
+        title=title
+    )
+
+    plot.update_traces(marker=dict(color=plot_color))
+
+    plot.update_layout(
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+    )
+
+    return plot
+
+
+def get_plot_df(view):
+    # Os gráficos só leem o dataset compartilhado, então ele não precisa ser copiado
+    if view != "All":
+        return get_state_df(view)
+    else:
+        return get_dataframe()
+
+
+def get_party_fields(party):
+    if party == "Democrats":
+        return "2020 Democrat vote %", democrat_color
+    else:
+        return "2020 Republican vote %", republican_color
+
+
+@variants(PAGE, "scatter", view=get_views, party=PARTIES, field=FIELDS)
+def scatter_figure(view, party, field):
+    y_axis_field, plot_color = get_party_fields(party)
+    return get_scatter_plot(get_plot_df(view), plot_color, field, y_axis_field, field, "Party Votes (percentage)", field)
+
+
+@variants(PAGE, "matrix", view=get_views, party=PARTIES, field=FIELDS, method=METHODS)
+def matrix_figure(view, party, field, method=PEARSON):
+    y_axis_field, _ = get_party_fields(party)
+    return get_corr_matrix_plot(view, field, y_axis_field, method)
@@ -0,0 +1,164 @@
+"""
+Builds every figure variant of the pages into the artifact directory that
+the pages read from (see figures.artifacts).
+
+Run from the repository root with `python -m figures.precompute`. Figures
+are built in a process pool; existing artifacts are kept unless --force is
+given, and --html also writes a static HTML export of every figure.
+"""
+import argparse
+import html
+import importlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote, unquote
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from figures.artifacts import ARTIFACT_ROOT, ARTIFACT_VERSION, MANIFEST_FILE, VARIANTS, artifact_path, get_artifact_dir
+from helpers.figure_cache import render_png
+
+FIGURE_MODULES = [
+    "figures.democrats_x_republicans",
+    "figures.education_level_x_party",
+    "figures.ethnicity_x_party",
+    "figures.income_distribution",
+    "figures.income_x_party",
+]
+
+PLOTLYJS_FILE = "plotly.min.js"
+
+
+def load_variants():
+    for module in FIGURE_MODULES:
+        importlib.import_module(module)
+
+    return {(page, name): (function, grid) for page, name, function, grid in VARIANTS}
+
+
+def enumerate_tasks(registry, only, exclude):
+    """Yields the (page, name, params) of every variant selected by --only/--exclude."""
+    for (page, name), (_, grid) in registry.items():
+        selectors = {page, f"{page}/{name}"}
+        if (only and not selectors & set(only)) or selectors & set(exclude):
+            continue
+
+        keys = list(grid)
+        values = [grid[key]() if callable(grid[key]) else grid[key] for key in keys]
+        for combination in itertools.product(*values):
+            yield page, name, dict(zip(keys, combination))
+
+
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_artifact(task):
+    """Builds one variant in a worker process and returns its path and size."""
+    page, name, params, artifact_dir, html_dir = task
+    function, _ = load_variants()[(page, name)]
+
+    start = time.perf_counter()
+    figure = function(**params)
+
+    if isinstance(figure, go.Figure):
+        path = artifact_path(page, name, params, ".json", artifact_dir)
+        write_atomic(path, pio.to_json(figure).encode())
+
+        if html_dir is not None:
+            html_path = artifact_path(page, name, params, ".html", html_dir)
+            write_atomic(html_path, pio.to_html(figure, include_plotlyjs=f"../../{PLOTLYJS_FILE}").encode())
+    else:
+        path = artifact_path(page, name, params, ".png", artifact_dir)
+        png = render_png(figure)
+        write_atomic(path, png)
+
+        if html_dir is not None:
+            write_atomic(artifact_path(page, name, params, ".png", html_dir), png)
+
+    return path, os.path.getsize(path), time.perf_counter() - start
+
+
+def write_html_index(html_dir):
+    """Links every exported figure from html_dir/index.html, grouped by page and figure."""
+    sections = []
+    for page in sorted(os.listdir(html_dir)):
+        page_dir = os.path.join(html_dir, page)
+        if not os.path.isdir(page_dir):
+            continue
+
+        sections.append(f"<h2>{html.escape(page)}</h2>")
+        for name in sorted(os.listdir(page_dir)):
+            links = []
+            for file_name in sorted(os.listdir(os.path.join(page_dir, name))):
+                stem, _ = os.path.splitext(file_name)
+                links.append(f'<li><a href="{page}/{name}/{quote(file_name)}">{html.escape(unquote(stem))}</a></li>')
+            sections.append(f"<h3>{html.escape(name)}</h3><ul>{''.join(links)}</ul>")
+
+    document = f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Dashboard US Election</title></head><body>{''.join(sections)}</body></html>"
+    write_atomic(os.path.join(html_dir, "index.html"), document.encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--output", default=ARTIFACT_ROOT, help="Root of the versioned artifact directories")
+    parser.add_argument("--only", nargs="+", default=[], help="Pages or page/figure names to build")
+    parser.add_argument("--exclude", nargs="+", default=[], help="Pages or page/figure names to skip")
+    parser.add_argument("--force", action="store_true", help="Rebuild artifacts that already exist")
+    parser.add_argument("--html", help="Also export every figure as static HTML to this directory")
+    args = parser.parse_args()
+
+    registry = load_variants()
+    artifact_dir = os.path.join(args.output, os.path.basename(get_artifact_dir()))
+    html_dir = os.path.abspath(args.html) if args.html else None
+
+    tasks = [
+        (page, name, params, artifact_dir, html_dir)
+        for page, name, params in enumerate_tasks(registry, args.only, args.exclude)
+        if args.force or html_dir is not None or not (
+            os.path.exists(artifact_path(page, name, params, ".json", artifact_dir))
+            or os.path.exists(artifact_path(page, name, params, ".png", artifact_dir))
+        )
+    ]
+    print(f"Building {len(tasks)} artifacts in {artifact_dir} with {args.jobs} workers")
+
+    if html_dir is not None:
+        write_atomic(os.path.join(html_dir, PLOTLYJS_FILE), get_plotlyjs().encode())
+
+    # The figures are already built in parallel, so each worker bootstraps its correlations on its own
+    os.environ["BOOTSTRAP_WORKERS"] = "1"
+
+    start = time.perf_counter()
+    total_bytes = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        for index, (path, size, seconds) in enumerate(executor.map(build_artifact, tasks, chunksize=4), start=1):
+            total_bytes += size
+            if index % 50 == 0 or index == len(tasks):
+                print(f"  {index}/{len(tasks)} {os.path.relpath(path, artifact_dir)} ({seconds:.2f}s)")
+
+    manifest = {
+        "artifact_version": ARTIFACT_VERSION,
+        "dataset": os.path.basename(artifact_dir).rsplit("-v", 1)[0],
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "artifacts": sum(file_name != MANIFEST_FILE for _, _, files in os.walk(artifact_dir) for file_name in files),
+    }
+    write_atomic(os.path.join(artifact_dir, MANIFEST_FILE), json.dumps(manifest, indent=2).encode())
+
+    if html_dir is not None:
+        write_html_index(html_dir)
+
+    print(f"Done in {time.perf_counter() - start:.1f}s, {total_bytes / 1e6:.1f} MB written")
+
+
+if __name__ == "__main__":
+    main()
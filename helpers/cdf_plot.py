@@ -1,29 +1,43 @@
-from typing import Tuple
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING, Optional, Tuple
 import numpy as np
-from scipy.stats import norm, gaussian_kde
 
-class CDFPlot:
-    def plot(self, desired_percentile: float, real_data: np.array) -> Tuple[plt.Figure, float]:
-        # Ordena os dados
-        real_data = np.sort(real_data)
+from helpers.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
-        # Calcula a média e o desvio padrão
-        mean = np.mean(real_data)
-        std_deviation = np.std(real_data)
+# Carregados apenas quando um gráfico é de fato desenhado
+matplotlib_figure = lazy_import("matplotlib.figure")
+stats = lazy_import("scipy.stats")
+
+class CDFPlot:
+    def plot(
+        self,
+        desired_percentile: float,
+        real_data: Optional[np.array] = None,
+        mean: Optional[float] = None,
+        std_deviation: Optional[float] = None,
+        x_percent: Optional[float] = None,
+    ) -> Tuple["Figure", float]:
+        # Calcula a média e o desvio padrão, caso não tenham sido pré-calculados
+        if mean is None or std_deviation is None:
+            mean = np.mean(real_data)
+            std_deviation = np.std(real_data)
 
         # Define os valores de x para o gráfico
         x = np.arange(0, mean + 3 * std_deviation, 10)
-        # Calcula os valores da CDF para cada x
-        cdf_values = [norm.cdf(xi, loc=mean, scale=std_deviation) for xi in x]
+        # Calcula os valores da CDF para todos os x de uma vez
+        cdf_values = stats.norm.cdf(x, loc=mean, scale=std_deviation)
 
-        # Calcula o valor x que corresponde ao percentil desejado
-        x_percent = norm.ppf(desired_percentile, loc=mean, scale=std_deviation)
+        # Calcula o valor x que corresponde ao percentil desejado, caso não tenha sido pré-calculado
+        if x_percent is None:
+            x_percent = stats.norm.ppf(desired_percentile, loc=mean, scale=std_deviation)
         # Como por definição, norm.cdf(x_percent) ≈ desired_percentile
-        cdf_at_x_percent = norm.cdf(x_percent, loc=mean, scale=std_deviation)
+        cdf_at_x_percent = stats.norm.cdf(x_percent, loc=mean, scale=std_deviation)
 
         # Cria a figura e um eixo para o gráfico da CDF
-        fig, ax = plt.subplots(figsize=(16,8))
+        fig = matplotlib_figure.Figure(figsize=(16,8))
+        ax = fig.subplots()
         
         # Plota a curva da CDF
         ax.plot(x, cdf_values, c='green', linewidth=1.5, linestyle=':')
@@ -0,0 +1,66 @@
+import io
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Hashable
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+def render_png(fig: "Figure") -> bytes:
+    """Renders `fig` as PNG bytes, with the settings st.pyplot uses, and releases it."""
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    finally:
+        fig.clear()
+
+    return buffer.getvalue()
+
+
+class FigureCache:
+    """
+    Bounded LRU cache of rendered matplotlib figures, stored as PNG bytes and
+    shared by every session of the process.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: Hashable, render: Callable[[], "Figure"]) -> bytes:
+        """
+        Returns the PNG of `key`, calling `render` to build the figure only
+        when it is not cached yet.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        png = render_png(render())
+
+        with self._lock:
+            self._entries[key] = png
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return png
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,24 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from helpers.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Carregado apenas quando o histograma é de fato desenhado
+matplotlib_figure = lazy_import("matplotlib.figure")
+
+
+class HistogramPlot:
+    def plot(self, real_data: np.array, title: str, xlabel: str) -> "Figure":
+        fig = matplotlib_figure.Figure(figsize=(14, 8))
+        ax = fig.subplots()
+
+        ax.hist(real_data, bins=50, color='blue', alpha=0.7, density=True)
+        ax.set_title(title, fontsize=16)
+        ax.set_xlabel(xlabel, fontsize=14)
+        ax.set_ylabel('Densidade', fontsize=14)
+
+        return fig
@@ -0,0 +1,38 @@
+"""
+Deferred imports of the heavy libraries (SciPy, matplotlib) used by only a
+few charts.
+
+lazy_import returns a stand-in for a module that imports it the first time
+one of its attributes is read. Pages whose charts come from a cache, or
+that never reach those charts, do not pay for the import at all.
+"""
+import importlib
+import threading
+from types import ModuleType
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Returns a stand-in for the module `name`, imported on first attribute access."""
+    return LazyModule(name)
@@ -1,33 +1,47 @@
-from typing import Tuple
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING, Optional, Tuple
 import numpy as np
-from scipy.stats import norm, gaussian_kde
+
+from helpers.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Carregados apenas quando um gráfico é de fato desenhado
+matplotlib_figure = lazy_import("matplotlib.figure")
+stats = lazy_import("scipy.stats")
 
 
 class PDFPlot:
-    def plot(self, desired_percentile: float, real_data: np.array) -> Tuple[plt.Figure, float]:
-        # Ordena os dados
-        real_data = np.sort(real_data)
-        
-        # Calcula a média e o desvio padrão
-        mean = np.mean(real_data)
-        std_deviation = np.std(real_data)
+    def plot(
+        self,
+        desired_percentile: float,
+        real_data: Optional[np.array] = None,
+        mean: Optional[float] = None,
+        std_deviation: Optional[float] = None,
+        x_percent: Optional[float] = None,
+    ) -> Tuple["Figure", float]:
+        # Calcula a média e o desvio padrão, caso não tenham sido pré-calculados
+        if mean is None or std_deviation is None:
+            mean = np.mean(real_data)
+            std_deviation = np.std(real_data)
 
         # Define os valores de x e calcula a densidade usando a distribuição normal
         x = np.arange(0, mean + 3 * std_deviation, 10)
-        probList = [norm.pdf(xi, loc=mean, scale=std_deviation) for xi in x]
+        probList = stats.norm.pdf(x, loc=mean, scale=std_deviation)
         
-        # Cria a figura e um único eixo
-        fig, ax = plt.subplots(figsize=(16,8))
+        # Cria a figura e um único eixo. A figura não é registrada no pyplot, então é liberada assim que deixa de ser usada
+        fig = matplotlib_figure.Figure(figsize=(16,8))
+        ax = fig.subplots()
         
         # Plota a curva e preenche a área sob ela
         ax.plot(x, probList, c='green', linewidth=1.5, linestyle=':')
         ax.fill_between(x, probList, facecolor='blue', alpha=0.3)
         
-        # Calcula o percentil desejado e preenche a área até esse valor
-        x_percent = norm.ppf(desired_percentile, loc=mean, scale=std_deviation)
+        # Calcula o percentil desejado, caso não tenha sido pré-calculado, e preenche a área até esse valor
+        if x_percent is None:
+            x_percent = stats.norm.ppf(desired_percentile, loc=mean, scale=std_deviation)
         mask = x < x_percent
-        ax.fill_between(x[mask], np.array(probList)[mask], facecolor='darkred')
+        ax.fill_between(x[mask], probList[mask], facecolor='darkred')
         
         # Define rótulos e título (reduzindo o padding)
         ax.set_xlabel('Valor')
@@ -0,0 +1,112 @@
+"""
+Scatter plots of county-level data that stay responsive in the browser.
+
+px.scatter draws one trace per color category, so coloring the counties by
+state produces ~51 traces per figure. Above WEBGL_POINT_THRESHOLD points,
+scatter() instead draws every point in a single WebGL trace, encoding the
+categories as numeric codes on a stepped colorscale, and adds one empty
+trace per category so the legend still lists them.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# px.scatter also switches to WebGL above this many points
+WEBGL_POINT_THRESHOLD = 1000
+
+RENDER_MODES = ("auto", "svg", "webgl")
+
+
+def stepped_colorscale(colors):
+    """A colorscale where code i of range(len(colors)) gets exactly colors[i]."""
+    if len(colors) == 1:
+        return [[0, colors[0]], [1, colors[0]]]
+
+    steps = np.linspace(0, 1, len(colors) + 1)
+    return [[float(position), color] for index, color in enumerate(colors) for position in steps[index:index + 2]]
+
+
+def scatter(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    color: Optional[str] = None,
+    size: Optional[str] = None,
+    hover_name: Optional[str] = None,
+    size_max: int = 20,
+    title: Optional[str] = None,
+    labels: Optional[Dict[str, str]] = None,
+    render_mode: str = "auto",
+) -> go.Figure:
+    """
+    Same arguments as px.scatter. With render_mode "auto" the single-trace
+    WebGL figure is used above WEBGL_POINT_THRESHOLD points, and px.scatter
+    below it.
+    """
+    if render_mode not in RENDER_MODES:
+        raise ValueError(f"render_mode must be one of {RENDER_MODES}, got '{render_mode}'")
+
+    if render_mode == "svg" or (render_mode == "auto" and len(df) <= WEBGL_POINT_THRESHOLD):
+        return px.scatter(df, x=x, y=y, color=color, size=size, hover_name=hover_name, size_max=size_max,
+                          title=title, labels=labels, render_mode="svg")
+
+    labels = labels or {}
+    marker = dict(opacity=0.7 if size else 1.0)
+    hovertemplate = [f"{labels.get(x, x)}=%{{x}}", f"{labels.get(y, y)}=%{{y}}"]
+
+    if size is not None:
+        sizes = df[size].to_numpy(dtype="float64")
+        # Same area scaling as px.scatter with size_max
+        marker.update(size=sizes, sizemode="area", sizeref=np.nanmax(sizes) / size_max ** 2, sizemin=0)
+        hovertemplate.append(f"{labels.get(size, size)}=%{{marker.size}}")
+
+    fig = go.Figure()
+    customdata = None
+
+    if color is not None:
+        codes, categories = pd.factorize(df[color])
+        palette = px.colors.qualitative.Plotly
+        colors = [palette[index % len(palette)] for index in range(len(categories))]
+
+        # Each code falls in the middle of its step of the colorscale
+        marker.update(color=codes, colorscale=stepped_colorscale(colors), cmin=-0.5, cmax=len(categories) - 0.5,
+                      showscale=False)
+        customdata = df[color].to_numpy()
+        hovertemplate.insert(0, f"{labels.get(color, color)}=%{{customdata}}")
+
+        # Legend proxies: empty traces that only carry the name and color of each category
+        for category, category_color in zip(categories, colors):
+            fig.add_trace(go.Scattergl(
+                x=[None],
+                y=[None],
+                mode="markers",
+                marker=dict(color=category_color),
+                name=str(category),
+                legendgroup=str(category),
+                hoverinfo="skip",
+            ))
+
+    fig.add_trace(go.Scattergl(
+        x=df[x].to_numpy(),
+        y=df[y].to_numpy(),
+        mode="markers",
+        marker=marker,
+        hovertext=df[hover_name].to_numpy() if hover_name is not None else None,
+        customdata=customdata,
+        hovertemplate=("<b>%{hovertext}</b><br>" if hover_name is not None else "")
+        + "<br>".join(hovertemplate) + "<extra></extra>",
+        showlegend=False,
+    ))
+
+    fig.update_layout(
+        title_text=title,
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get(y, y),
+        legend_title_text=labels.get(color, color) if color is not None else None,
+        legend_tracegroupgap=0,
+    )
+
+    return fig
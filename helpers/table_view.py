@@ -0,0 +1,101 @@
+"""
+A paginated view of a large DataFrame for st.dataframe.
+
+Sorting, filtering and column selection happen on the server, and only the
+rows of the current page, with the selected columns, are sent to the
+browser.
+"""
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100]
+
+
+def query_table(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    search: str = "",
+    search_columns: Sequence[str] = (),
+    sort_by: Optional[str] = None,
+    ascending: bool = True,
+    page: int = 1,
+    page_size: int = PAGE_SIZES[0],
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Returns the rows of page `page` (from 1) of `df` and the number of rows
+    matching the query.
+
+    Rows are kept when any of `search_columns` contains `search` (ignoring
+    case), then sorted by `sort_by` with missing values last. Only the page
+    itself is projected on `columns` and copied.
+    """
+    positions = pd.RangeIndex(len(df))
+
+    if search:
+        matches = pd.Series(False, index=df.index)
+        for column in search_columns:
+            matches |= df[column].astype(str).str.contains(search, case=False, regex=False, na=False)
+        positions = positions[matches.to_numpy()]
+
+    if sort_by is not None:
+        order = df[sort_by].iloc[positions].reset_index(drop=True).sort_values(
+            ascending=ascending, kind="stable", na_position="last"
+        ).index
+        positions = positions[order]
+
+    start = (page - 1) * page_size
+    return df.iloc[positions[start:start + page_size]][list(columns)], len(positions)
+
+
+@st.fragment
+def table_view(df: pd.DataFrame, key: str, search_columns: List[str], default_columns: Optional[List[str]] = None):
+    """
+    Draws the widgets of the view and the current page of `df`. The view is a
+    fragment, so its widgets only rerun the view and not the whole page.
+    """
+    columns = st.multiselect(
+        "Colunas exibidas",
+        list(df.columns),
+        default=default_columns or list(df.columns),
+        key=f"{key}_columns",
+    )
+
+    search_col, sort_col, order_col, size_col = st.columns([3, 3, 1, 1])
+    with search_col:
+        search = st.text_input(f"Buscar por {' ou '.join(search_columns)}", key=f"{key}_search")
+    with sort_col:
+        sort_by = st.selectbox("Ordenar por", [None, *df.columns], key=f"{key}_sort_by",
+                               format_func=lambda column: "—" if column is None else column)
+    with order_col:
+        ascending = st.radio("Ordem", ["↑", "↓"], key=f"{key}_order", horizontal=True) == "↑"
+    with size_col:
+        page_size = st.selectbox("Linhas", PAGE_SIZES, key=f"{key}_page_size")
+
+    # O total de páginas depende do filtro, então a página é limitada depois da consulta
+    page_key = f"{key}_page"
+    page = st.session_state.get(page_key, 1)
+
+    # Uma nova busca, ordenação ou tamanho de página volta para a primeira página
+    query = (search, sort_by, ascending, page_size)
+    if st.session_state.get(f"{key}_query", query) != query:
+        page = 1
+    st.session_state[f"{key}_query"] = query
+
+    page_df, total_rows = query_table(df, columns, search, search_columns, sort_by, ascending, page, page_size)
+    pages = max(1, math.ceil(total_rows / page_size))
+    if page > pages:
+        page = pages
+        page_df, total_rows = query_table(df, columns, search, search_columns, sort_by, ascending, page, page_size)
+    st.session_state[page_key] = page
+
+    st.dataframe(page_df)
+
+    info_col, page_col = st.columns([3, 1])
+    with page_col:
+        st.number_input(f"Página (de {pages})", min_value=1, max_value=pages, key=page_key)
+    with info_col:
+        first_row = (page - 1) * page_size + 1 if total_rows else 0
+        st.caption(f"Linhas {first_row}–{min(page * page_size, total_rows)} de {total_rows}")
@@ -0,0 +1,184 @@
+"""
+Lightweight timing spans for the dashboard.
+
+Code is instrumented with `with span("name", label=value):`. Every span is
+kept in memory, per name and labels, to report p50/p95 durations over the
+last WINDOW_SIZE runs, and is appended as one JSON line to the file named by
+DASHBOARD_TIMING_LOG when it is set. The spans used by the dashboard are:
+
+- data_load: loading the shared dataset (get_dataframe)
+- transform{node}: computing a derived table (dataset/derived.py)
+- figure{page, figure, source}: reading or building a page figure
+- serialize{page, figure}: sending a figure to the browser (st.plotly_chart, st.image)
+
+Pages call debug_panel() at the end, which shows the statistics in the
+sidebar when DASHBOARD_DEBUG=1 is set or the page is opened with ?debug=1.
+`python -m helpers.timing <log>` prints a JSON-lines log in the Prometheus
+text format.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from helpers.lazy_import import lazy_import
+
+# Only the pages need Streamlit; the dataset and the precompute job record spans without it
+st = lazy_import("streamlit")
+
+TIMING_LOG_PATH = os.environ.get("DASHBOARD_TIMING_LOG")
+DEBUG_PANEL = os.environ.get("DASHBOARD_DEBUG", "0") == "1"
+
+# Number of recent durations of each span used for the percentiles
+WINDOW_SIZE = 1000
+
+QUANTILES = [0.5, 0.95]
+
+METRIC_NAME = "dashboard_span_seconds"
+
+SpanKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class SpanRecorder:
+    """Durations of the spans of the process, shared by every session."""
+
+    def __init__(self, log_path=None, window_size=WINDOW_SIZE):
+        self.log_path = log_path
+        self._durations = defaultdict(lambda: deque(maxlen=window_size))
+        self._totals = defaultdict(lambda: [0, 0.0])
+        self._lock = threading.Lock()
+
+    def record(self, name, labels, seconds):
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+
+        with self._lock:
+            self._durations[key].append(seconds)
+            self._totals[key][0] += 1
+            self._totals[key][1] += seconds
+
+            if self.log_path is not None:
+                record = {"time": round(time.time(), 3), "span": name, "labels": dict(key[1]), "seconds": round(seconds, 6)}
+                with open(self.log_path, "a") as file:
+                    file.write(json.dumps(record) + "\n")
+
+    def summary(self) -> Dict[SpanKey, dict]:
+        """Returns the count, total and p50/p95 in seconds of every span, by (name, labels)."""
+        with self._lock:
+            items = [(key, np.array(durations), *self._totals[key]) for key, durations in self._durations.items()]
+
+        return {
+            key: {
+                "count": count,
+                "sum": total,
+                **{quantile: float(np.quantile(durations, quantile)) for quantile in QUANTILES},
+            }
+            for key, durations, count, total in sorted(items)
+        }
+
+
+recorder = SpanRecorder(TIMING_LOG_PATH)
+
+
+@contextmanager
+def span(name, **labels):
+    """Times the body of the with statement as span `name` with `labels`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.record(name, labels, time.perf_counter() - start)
+
+
+def prometheus_text(summary: Dict[SpanKey, dict]) -> str:
+    """Formats a summary as a Prometheus summary metric."""
+    lines = [
+        f"# HELP {METRIC_NAME} Duration of the dashboard timing spans.",
+        f"# TYPE {METRIC_NAME} summary",
+    ]
+
+    for (name, labels), stats in summary.items():
+        label_text = ",".join(f'{label}="{escape_label(value)}"' for label, value in (("span", name), *labels))
+        for quantile in QUANTILES:
+            lines.append(f'{METRIC_NAME}{{{label_text},quantile="{quantile}"}} {stats[quantile]:.6f}')
+        lines.append(f"{METRIC_NAME}_sum{{{label_text}}} {stats['sum']:.6f}")
+        lines.append(f"{METRIC_NAME}_count{{{label_text}}} {stats['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+def escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def plotly_chart(page, name, figure, container=None, **kwargs):
+    """
+    st.plotly_chart (or container.plotly_chart), timed as the serialize span
+    of figure `name` of `page`.
+    """
+    with span("serialize", page=page, figure=name):
+        return (st if container is None else container).plotly_chart(figure, **kwargs)
+
+
+def image(page, name, png, container=None, **kwargs):
+    """st.image (or container.image), timed as the serialize span of figure `name` of `page`."""
+    with span("serialize", page=page, figure=name):
+        return (st if container is None else container).image(png, **kwargs)
+
+
+def debug_panel():
+    """Shows p50/p95 of every span in the sidebar, when the debug panel is enabled."""
+    if not DEBUG_PANEL and st.query_params.get("debug") != "1":
+        return
+
+    summary = recorder.summary()
+    table = pd.DataFrame(
+        [
+            {
+                "span": name,
+                "labels": ", ".join(f"{label}={value}" for label, value in labels),
+                "n": stats["count"],
+                "p50 (ms)": stats[0.5] * 1000,
+                "p95 (ms)": stats[0.95] * 1000,
+            }
+            for (name, labels), stats in summary.items()
+        ]
+    )
+
+    with st.sidebar:
+        st.subheader("Tempos de execução")
+        st.dataframe(table, hide_index=True)
+        st.download_button("Exportar (Prometheus)", prometheus_text(summary), file_name="dashboard_spans.prom")
+
+
+def read_log(lines: Iterable[str]) -> SpanRecorder:
+    """Loads the spans of a JSON-lines log into a new recorder."""
+    log_recorder = SpanRecorder(window_size=None)
+    for line in lines:
+        if line.strip():
+            record = json.loads(line)
+            log_recorder.record(record["span"], record["labels"], record["seconds"])
+
+    return log_recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prints a timing log in the Prometheus text format")
+    parser.add_argument("log", nargs="?", default=TIMING_LOG_PATH, help="JSON-lines log (default: $DASHBOARD_TIMING_LOG)")
+    args = parser.parse_args()
+
+    if args.log is None:
+        parser.error("no log given and DASHBOARD_TIMING_LOG is not set")
+
+    with open(args.log, "r") as file:
+        print(prometheus_text(read_log(file).summary()), end="")
+
+
+if __name__ == "__main__":
+    main()
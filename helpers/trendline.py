@@ -0,0 +1,46 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from dataset.regression import confidence_band
+
+# Points along the line; the band is curved, so a straight segment is not enough
+TRENDLINE_POINTS = 50
+
+
+def add_trendline(fig: go.Figure, fit, color: str, level: float = 0.95) -> go.Figure:
+    """
+    Draws the line of `fit` (a row of dataset.regression.fit_lines) over the
+    range of its points, with its `level` confidence band, like
+    trendline="ols" does in px.scatter.
+    """
+    if np.isnan(fit["slope"]):
+        return fig
+
+    x = np.linspace(fit["x_min"], fit["x_max"], TRENDLINE_POINTS)
+    fitted, lower, upper = confidence_band(fit, x, level)
+
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([x, x[::-1]]),
+        y=np.concatenate([upper, lower[::-1]]),
+        fill="toself",
+        fillcolor=color,
+        opacity=0.2,
+        line=dict(width=0),
+        hoverinfo="skip",
+        showlegend=False,
+    ))
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=fitted,
+        mode="lines",
+        line=dict(color=color),
+        hovertemplate=(
+            "<b>OLS trendline</b><br>"
+            f"y = {fit['slope']:.6g} * x + {fit['intercept']:.6g}<br>"
+            f"R<sup>2</sup>={fit['r_squared']:.6f}<br>"
+            "%{x}, %{y}<extra></extra>"
+        ),
+        showlegend=False,
+    ))
+
+    return fig
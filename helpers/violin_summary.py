@@ -0,0 +1,144 @@
+"""
+Violin plots drawn from precomputed summaries instead of raw points.
+
+px.violin ships every point to the browser, which then computes one kernel
+density per trace. Here the quartiles, fences and a density evaluated on a
+fixed grid are computed once per (x, color) group on the server, and the
+figure only carries those summaries: one filled outline trace and one box
+trace per color.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# The outlines are drawn as splines, so a coarse grid is enough
+GRID_SIZE = 16
+
+
+def silverman_bandwidth(values: np.ndarray) -> float:
+    # Same rule plotly.js uses for its violins
+    q1, q3 = np.percentile(values, [25, 75])
+    spread = np.std(values, ddof=1) if len(values) > 1 else 0.0
+    if q3 > q1:
+        spread = min(spread, (q3 - q1) / 1.349)
+
+    bandwidth = 1.059 * spread * len(values) ** -0.2
+    return bandwidth if bandwidth > 0 else max(abs(float(values[0])) * 0.01, 1e-9)
+
+
+def summarize_group(values: np.ndarray, grid_size: int = GRID_SIZE) -> dict:
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    bandwidth = silverman_bandwidth(values)
+
+    # Like plotly's default "soft" span, the outline extends two bandwidths
+    # past the extreme values.
+    grid = np.linspace(values.min() - 2 * bandwidth, values.max() + 2 * bandwidth, grid_size)
+    density = np.exp(-0.5 * ((grid[:, None] - values[None, :]) / bandwidth) ** 2).sum(axis=1)
+
+    return {
+        "count": len(values),
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lowerfence": values[values >= q1 - 1.5 * iqr].min(),
+        "upperfence": values[values <= q3 + 1.5 * iqr].max(),
+        "grid": grid,
+        "density": density / density.max(),
+    }
+
+
+def summarize_violins(df: pd.DataFrame, value_column: str, x_column: str, color_column: str) -> pd.DataFrame:
+    """
+    Returns one row per (x, color) group of `df` with the count, quartiles,
+    box fences, and the density of `value_column` (scaled to a maximum of 1)
+    on a grid of GRID_SIZE values. Groups keep their order of appearance.
+    """
+    rows = []
+    for (x, color), values in df.groupby([x_column, color_column], observed=True, sort=False)[value_column]:
+        values = values.dropna().to_numpy(dtype="float64")
+        if len(values):
+            rows.append({x_column: x, color_column: color, **summarize_group(values)})
+
+    return pd.DataFrame(rows)
+
+
+def round_values(values: np.ndarray, span: float) -> list:
+    """
+    Rounds `values` to a thousandth of `span`, which is below what a chart
+    can show, and writes whole numbers as ints (and NaN as None) so the JSON
+    of the figure stays short.
+    """
+    decimals = 3 - int(np.floor(np.log10(span))) if span > 0 else 3
+    values = np.round(np.asarray(values, dtype="float64"), decimals)
+    if decimals > 0:
+        return [None if np.isnan(value) else value for value in values.tolist()]
+
+    return [None if np.isnan(value) else int(value) for value in values.tolist()]
+
+
+def summary_violin_figure(
+    summary: pd.DataFrame,
+    x_column: str,
+    color_column: str,
+    color_discrete_map: Optional[Dict[str, str]] = None,
+    width: float = 0.8,
+) -> go.Figure:
+    """
+    Draws the violins and boxes described by summarize_violins, grouping the
+    colors side by side within each x category, as px.violin does.
+    """
+    color_discrete_map = color_discrete_map or {}
+    x_values = list(dict.fromkeys(summary[x_column]))
+    colors = list(dict.fromkeys(summary[color_column]))
+    positions = {x: index for index, x in enumerate(x_values)}
+
+    slot = width / len(colors)
+    span = float(np.ptp(np.concatenate(summary["grid"].to_list())))
+
+    fig = go.Figure()
+    for color_index, color in enumerate(colors):
+        groups = summary[summary[color_column] == color]
+        centers = np.array([positions[x] for x in groups[x_column]]) + (color_index - (len(colors) - 1) / 2) * slot
+        trace_color = color_discrete_map.get(color)
+
+        # Every outline is a closed polygon; NaN separators keep them in a single trace
+        outline_x, outline_y = [], []
+        for center, grid, density in zip(centers, groups["grid"], groups["density"]):
+            half_width = density * slot * 0.475
+            outline_x += [center - half_width, (center + half_width)[::-1], [np.nan]]
+            outline_y += [grid, grid[::-1], [np.nan]]
+
+        fig.add_trace(go.Scatter(
+            x=round_values(np.concatenate(outline_x), len(x_values)),
+            y=round_values(np.concatenate(outline_y), span),
+            mode="lines",
+            fill="toself",
+            line=dict(width=1, color=trace_color, shape="spline"),
+            name=str(color),
+            legendgroup=str(color),
+            hoverinfo="skip",
+        ))
+        fig.add_trace(go.Box(
+            x=round_values(centers, len(x_values)),
+            q1=round_values(groups["q1"].to_numpy(), span),
+            median=round_values(groups["median"].to_numpy(), span),
+            q3=round_values(groups["q3"].to_numpy(), span),
+            lowerfence=round_values(groups["lowerfence"].to_numpy(), span),
+            upperfence=round_values(groups["upperfence"].to_numpy(), span),
+            width=slot * 0.2,
+            marker_color=trace_color,
+            line_width=2.5,
+            name=str(color),
+            legendgroup=str(color),
+            showlegend=False,
+        ))
+
+    fig.update_layout(
+        legend_title_text=color_column,
+        xaxis=dict(tickmode="array", tickvals=list(positions.values()), ticktext=x_values),
+    )
+
+    return fig
@@ -1,6 +1,8 @@
 import streamlit as st
 
 from dataset.get_dataset import get_dataframe
+from helpers.table_view import table_view
+from helpers.timing import debug_panel
 
 st.set_page_config(
     page_title="Etapa 3 PVD",
@@ -29,7 +31,8 @@ O dataset utilizado foi o "Ultimate US Election Dataset" disponível no Kaggle p
 Nós realizamos algumas operações de limpeza nos dados, afim de remover símbolos inválidos, converter alguns dados binarizados para uma codificação válida, dentre outras medidas. O resultado é exibido na tabela interativa abaixo.
 '''
 
-st.dataframe(df)
+# A ordenação, os filtros e a paginação são feitos no servidor: só a página visível é enviada ao navegador
+table_view(df, key="dataset", search_columns=["state", "county"])
 
 '''
 # Sobre este trabalho
@@ -49,4 +52,6 @@ Utilizamos o streamlit para permitir interação, não apenas para controlar os
 Além da documentação oficial, consideramos o vídeo abaixo como uma boa introdução ao streamlit.
 '''
 
-st.video('https://youtu.be/D0D4Pa22iG0')
\ No newline at end of file
+st.video('https://youtu.be/D0D4Pa22iG0')
+
+debug_panel()
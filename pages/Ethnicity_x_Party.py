@@ -1,59 +1,9 @@
 import streamlit as st
 import plotly.express as px
-import pandas as pd
-import requests
-from dataset.get_dataset import get_dataframe
-
-def get_state_votes_df(df):
-    state_votes_df = df.groupby("state")[["2020 Democrat vote raw", "2020 Republican vote raw", "2020 other vote raw"]].sum()
-
-    state_votes_df["total_votes"] = state_votes_df.sum(axis=1)
-
-    state_votes_df["democrat_percentage"] = (state_votes_df["2020 Democrat vote raw"] / state_votes_df["total_votes"])
-    state_votes_df["republican_percentage"] = (state_votes_df["2020 Republican vote raw"] / state_votes_df["total_votes"])
-    state_votes_df["other_percentage"] = (state_votes_df["2020 other vote raw"] / state_votes_df["total_votes"])
-
-    state_votes_df.reset_index(inplace=True)
-
-    return state_votes_df
-
-def calculate_state_correlation(df, ethnicity_type, party_type):
-    if party_type == 'Democrats':
-        party_column = '2020 Democrat vote raw'
-    elif party_type == 'Republicans':
-        party_column = '2020 Republican vote raw'
-    else:
-        party_column = '2020 other vote raw'
-    
-    state_correlations = []
-
-    for state in df['state'].unique():
-        state_df = df[df['state'] == state]
-        correlation = state_df[ethnicity_type].corr(state_df[party_column])
-        state_correlations.append({'state': state, 'correlation': correlation})
-
-    return pd.DataFrame(state_correlations)
-
-def create_choropleth_map(df, geojson_data, field_name, property_name, color_map):
-    map_plot = px.choropleth_mapbox(
-        data_frame=df,
-        geojson=geojson_data,
-        color="correlation",
-        locations=field_name,
-        featureidkey=property_name,
-        color_continuous_scale=color_map,
-        center={"lat": 37.0902, "lon": -95.7129},
-        zoom=3,
-        range_color=(-1, 1),
-        mapbox_style="carto-positron",
-        height=600
-    )
-    
-    map_plot.update_layout(
-        margin={"r": 0, "t": 0, "l": 0, "b": 0},
-        autosize=True
-    )
-    return map_plot
+from dataset.correlation import ETHNICITY_COLUMNS
+from figures.artifacts import get_figure
+from figures.ethnicity_x_party import PAGE, PARTIES, map_figure, scatter_figure
+from helpers.timing import debug_panel, plotly_chart
 
 def create_scatter_plot(df, ethnicity_type):
     if ethnicity_type not in df.columns:
@@ -76,44 +26,6 @@ def create_scatter_plot(df, ethnicity_type):
     )
     return scatter_plot
 
-def create_ethnicity_vote_scatter(df, ethnicity_type, party_type):
-    republican_color = "#F2545B"
-    democrat_color = "#216681"
-    not_selected_color = "#D3D3D3"
-    
-    if party_type == 'Democrats':
-        party_column = 'democrat_percentage'
-        point_color = democrat_color  # Cor para Democratas
-    elif party_type == 'Republicans':
-        party_column = 'republican_percentage'
-        point_color = republican_color  # Cor para Republicanos
-    else:
-        party_column = 'other_percentage'
-        point_color = not_selected_color  # Cor para outros (caso exista)
-    
-    if ethnicity_type not in df.columns:
-        st.error(f"A coluna '{ethnicity_type}' não existe no DataFrame.")
-        return None
-    
-    # Criar o gráfico de dispersão
-    scatter_plot = px.scatter(
-        df,
-        x=ethnicity_type,
-        y=party_column,
-        hover_name="state",
-        labels={
-            ethnicity_type: f"Porcentagem de {ethnicity_type}",
-            party_column: f"Porcentagem de Votos {party_type}"
-        },
-        title=f"Relação entre {ethnicity_type} e Votos {party_type}",
-        trendline="ols"  # Adicionar uma linha de tendência linear
-    )
-    
-    # Definir a cor dos pontos manualmente
-    scatter_plot.update_traces(marker=dict(color=point_color))
-    
-    return scatter_plot
-
 # Streamlit UI
 st.set_page_config(page_title="Ethnicity and Vote Correlation", layout="wide")
 
@@ -128,51 +40,23 @@ st.markdown(
 
 st.write("# Correlation Between Ethnicity and Vote by State")
 
-df = get_dataframe()
-df_state = get_state_votes_df(df)
-
-df_state['majority_party'] = df_state.apply(
-    lambda row: 'Democrats' if row['democrat_percentage'] > row['republican_percentage'] else 'Republicans', axis=1)
-
 ethnicity_type = st.selectbox(
     "Select ethnicity", 
-    ["Hispanic or Latino percentage", "NH-White percentage", "NH-Black percentage", 
-     "NH-American Indian and Alaska Native percentage", "NH-Asian percentage", 
-     "NH-Native Hawaiian and Other Pacific Islander percentage", "NH-Some Other Race percentage"],
+    ETHNICITY_COLUMNS,
     key="ethnicity_selectbox"
 )
 
 party_filter = st.selectbox(
     "Select Party",
-    ["Democrats", "Republicans"],
+    PARTIES,
     key="party_selectbox"
 )
 
-df_state_filtered = df_state.copy()
-
-if party_filter == "Democrats":
-    df_state_filtered = df_state_filtered[df_state_filtered['majority_party'] == 'Democrats']
-elif party_filter == "Republicans":
-    df_state_filtered = df_state_filtered[df_state_filtered['majority_party'] == 'Republicans']
-
-state_correlations = calculate_state_correlation(df, ethnicity_type, party_filter)
-df_state_filtered = pd.merge(df_state_filtered, state_correlations, on="state")
-
-# Adicionar as colunas de etnia ao DataFrame filtrado
-df_ethnicity = df.groupby("state")[ethnicity_type].mean().reset_index()
-df_state_filtered = pd.merge(df_state_filtered, df_ethnicity, on="state")
-
-# Carregar o GeoJSON dos estados
-url = "https://raw.githubusercontent.com/PublicaMundi/MappingAPI/master/data/geojson/us-states.json"
-response = requests.get(url)
-geo_json_data = response.json()
-
-# Criar o mapa interativo
-map_plot = create_choropleth_map(df_state_filtered, geo_json_data, field_name="state", 
-                                  property_name="properties.name", color_map="Viridis")
+# Criar o mapa interativo (pré-calculado, quando existe um artefato)
+map_plot = get_figure(PAGE, "map", map_figure, ethnicity_type=ethnicity_type, party_filter=party_filter)
 
 # Exibir o mapa no Streamlit
-st.plotly_chart(map_plot, use_container_width=True)
+plotly_chart(PAGE, "map", map_plot, use_container_width=True)
 
 # Texto de explicação
 st.write("""
@@ -192,20 +76,35 @@ st.write("""
 - Estados com cores **neutras** (correlação próxima de 0) sugerem que a etnia não é um fator determinante para os votos no partido.
 """)
 
-# Adicionar o selectbox para selecionar o partido para o novo scatter plot
-party_scatter = st.selectbox(
-    "Select Party for Ethnicity vs Vote Scatter Plot",
-    ["Democrats", "Republicans"],
-    key="party_scatter_selectbox"
-)
+# O gráfico de dispersão tem o próprio filtro de partido: é um fragmento, então mudar esse filtro não refaz o mapa
+@st.fragment
+def ethnicity_vote_scatter_block(ethnicity_type, party_filter):
+    # Adicionar o selectbox para selecionar o partido para o novo scatter plot
+    party_scatter = st.selectbox(
+        "Select Party for Ethnicity vs Vote Scatter Plot",
+        PARTIES,
+        key="party_scatter_selectbox"
+    )
+
+    # Criar e exibir o novo gráfico de dispersão
+    ethnicity_vote_scatter = get_figure(
+        PAGE,
+        "scatter",
+        scatter_figure,
+        ethnicity_type=ethnicity_type,
+        party_filter=party_filter,
+        party_scatter=party_scatter,
+    )
+    if ethnicity_vote_scatter:
+        plotly_chart(PAGE, "scatter", ethnicity_vote_scatter, use_container_width=True)
+
+    # Texto de interpretação do novo gráfico de dispersão
+    st.write("### Interpretação do Gráfico de Dispersão: Etnia vs Votos")
+    st.write(f"""
+    Este gráfico de dispersão mostra a relação entre a **{ethnicity_type}** (eixo X) e a **porcentagem de votos {party_scatter}** (eixo Y) em cada estado dos Estados Unidos. 
+    """)
+
 
-# Criar e exibir o novo gráfico de dispersão
-ethnicity_vote_scatter = create_ethnicity_vote_scatter(df_state_filtered, ethnicity_type, party_scatter)
-if ethnicity_vote_scatter:
-    st.plotly_chart(ethnicity_vote_scatter, use_container_width=True)
+ethnicity_vote_scatter_block(ethnicity_type, party_filter)
 
-# Texto de interpretação do novo gráfico de dispersão
-st.write("### Interpretação do Gráfico de Dispersão: Etnia vs Votos")
-st.write(f"""
-Este gráfico de dispersão mostra a relação entre a **{ethnicity_type}** (eixo X) e a **porcentagem de votos {party_scatter}** (eixo Y) em cada estado dos Estados Unidos. 
-""")
\ No newline at end of file
+debug_panel()
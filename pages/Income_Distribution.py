@@ -1,41 +1,23 @@
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt
 import streamlit as st
-import plotly.express as px
-import numpy as np
-import pandas as pd
-from dataset.get_dataset import get_dataframe
-from helpers.cdf_plot import CDFPlot
-from helpers.pdf_plot import PDFPlot
+from dataset.derived import ALL_STATES, get_mean_income_fit
+from figures.artifacts import get_figure, get_png
+from figures.income_distribution import (
+    PAGE,
+    cdf_figure,
+    get_states,
+    histogram_figure,
+    mean_violin_figure,
+    median_violin_figure,
+    pdf_figure,
+    state_mean_violin_figure,
+    state_median_violin_figure,
+    state_pdf_figure,
+)
+from helpers.timing import debug_panel, image, plotly_chart
 
 ## Visualization of this graph still needs to be fixed##
 
 
-def get_state_data(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Calculates and returns a new DataFrame with state-level data.
-
-    Args:
-        df: The input DataFrame with county-level data.
-
-    Returns:
-        A new DataFrame with the following columns:
-        - state: The name of the state.
-        - mean_income: The average mean income for the state.
-        - median_income: The average median income for the state.
-        - most_voted_party: The party with the most votes in the state.
-    """
-
-    # Calculate the most voted party for each county
-    df['most_voted_party'] = df.apply(
-        lambda row: 'Democrat' if row['2020 Democrat vote raw'] > row['2020 Republican vote raw'] and row['2020 Democrat vote raw'] > row['2020 other vote raw']
-        else 'Republican' if row['2020 Republican vote raw'] > row['2020 Democrat vote raw'] and row['2020 Republican vote raw'] > row['2020 other vote raw']
-        else 'Other', axis=1
-    )
-
-    return df
-
-
 st.set_page_config(page_title="Income Distribution", layout="wide")
 
 st.title("Pergunta 2")
@@ -47,38 +29,10 @@ st.markdown(
         - Hipótese2: Não Existe uma correlação entre concentração de renda e partido de voto
     """
 )
-df = get_dataframe()
-mod_df = get_state_data(df)  # Use o dataframe agregado por estado!
-
 # Violin plot para Mean Income
-fig_mean = px.violin(mod_df,
-                     y="Mean income (dollars)",
-                     x="state",
-                     color="most_voted_party",
-                     box=True,  # Mostra a caixa
-                     points="all",  # Mostra todos os pontos
-                     color_discrete_map={'Democrat': 'blue',
-                                         'Republican': 'red', 'Other': 'gray'},
-                     )
-fig_mean.update_traces(
-    jitter=0.7,  # Adiciona jitter horizontal aos pontos
-    pointpos=0,  # Posiciona os pontos no centro
-    marker=dict(size=7, opacity=0.7),  # Melhora a visualização dos pontos
-)
-fig_mean.update_layout(
-    title_text="Mean Income by State",
-    yaxis_title="Mean Income (dollars)",
-    xaxis_title="State"
-)
+fig_mean = get_figure(PAGE, "mean_violin", mean_violin_figure)
 
-fig_mean.update_traces(
-    jitter=0.7,
-    pointpos=0,
-    marker=dict(size=7, opacity=0.7),
-    line_width=2.5  # Adicione esta linha para aumentar a espessura da linha da caixa
-)
-
-st.plotly_chart(fig_mean)
+plotly_chart(PAGE, "mean_violin", fig_mean)
 
 '''
     **Imagem:** O gráfico de Velas (ou Candlestick) apresenta a média de 
@@ -87,36 +41,9 @@ renda por estado, levando em consideração o partido ganhador
 '''
 
 # Violin plot para Median Income (similar ao anterior)
-fig_median = px.violin(mod_df,
-                       y="Median income (dollars)",
-                       x="state",
-                       color="most_voted_party",
-                       box=True,  # Mostra a caixa
-                       points="all",  # Mostra todos os pontos
-                       color_discrete_map={'Democrat': 'blue',
-                                           'Republican': 'red', 'Other': 'gray'},
-                       )
-
-fig_median.update_traces(
-    jitter=0.7,  # Adiciona jitter horizontal aos pontos
-    pointpos=0,  # Posiciona os pontos no centro
-    marker=dict(size=7, opacity=0.7),  # Melhora a visualização dos pontos
-)
+fig_median = get_figure(PAGE, "median_violin", median_violin_figure)
 
-fig_median.update_layout(
-    title_text="Median Income by State",
-    yaxis_title="Median Income (dollars)",
-    xaxis_title="State",
-)
-
-fig_median.update_traces(
-    jitter=0.7,
-    pointpos=0,
-    marker=dict(size=7, opacity=0.7),
-    line_width=2.5  # Adicione esta linha para aumentar a espessura da linha da caixa
-)
-
-st.plotly_chart(fig_median)
+plotly_chart(PAGE, "median_violin", fig_median)
 
 '''
 **Imagem:** O gráfico de Velas (ou Candlestick em inglês)
@@ -127,92 +54,48 @@ apresenta a mediana de renda por estado, levando
 '''
 
 
-col1, col2 = st.columns([1, 1])
+# Cada bloco de widgets e gráficos é um fragmento: mudar um filtro só executa de novo o próprio bloco
+@st.fragment
+def state_violins(states):
+    col1, col2 = st.columns([1, 1])
 
-with col1:
-    selected_state_pdf = st.selectbox(
-        "Selecione o estado",
-        sorted(df["state"].unique())
-    )
+    with col1:
+        selected_state_pdf = st.selectbox(
+            "Selecione o estado",
+            states
+        )
 
-df_state_violin = mod_df[mod_df["state"] == selected_state_pdf]
-
-# Violin plot para Mean Income
-fig_mean = px.violin(df_state_violin,
-                     y="Mean income (dollars)",
-                     x="state",
-                     color="most_voted_party",
-                     box=True,  # Mostra a caixa
-                     points="all",  # Mostra todos os pontos
-                     color_discrete_map={'Democrat': 'blue',
-                                         'Republican': 'red', 'Other': 'gray'},
-                     )
-
-fig_mean.update_traces(
-    jitter=0.7,  # Adiciona jitter horizontal aos pontos
-    pointpos=0,  # Posiciona os pontos no centro
-    marker=dict(size=7, opacity=0.7),  # Melhora a visualização dos pontos
-)
-fig_mean.update_layout(
-    title_text="Mean Income by State",
-    yaxis_title="Mean Income (dollars)",
-    xaxis_title="State"
-)
-
-fig_mean.update_traces(
-    jitter=0.7,
-    pointpos=0,
-    marker=dict(size=7, opacity=0.7),
-    line_width=2.5  # Adicione esta linha para aumentar a espessura da linha da caixa
-)
+    # Violin plot para Mean Income
+    fig_mean = get_figure(PAGE, "state_mean_violin", state_mean_violin_figure, selected_state_pdf=selected_state_pdf)
 
-st.plotly_chart(fig_mean)
+    plotly_chart(PAGE, "state_mean_violin", fig_mean)
 
-'''
-    **Imagem:** O gráfico de Velas (ou Candlestick) apresenta a média de 
-renda por estado, levando em consideração o partido ganhador
- (Democrata ou Republicano) de cada condado.
-'''
+    st.markdown(
+        """
+        **Imagem:** O gráfico de Velas (ou Candlestick) apresenta a média de
+        renda por estado, levando em consideração o partido ganhador
+        (Democrata ou Republicano) de cada condado.
+        """
+    )
 
-# Violin plot para Median Income (similar ao anterior)
-fig_median = px.violin(df_state_violin,
-                       y="Median income (dollars)",
-                       x="state",
-                       color="most_voted_party",
-                       box=True,  # Mostra a caixa
-                       points="all",  # Mostra todos os pontos
-                       color_discrete_map={'Democrat': 'blue',
-                                           'Republican': 'red', 'Other': 'gray'},
-                       )
-
-fig_median.update_traces(
-    jitter=0.7,  # Adiciona jitter horizontal aos pontos
-    pointpos=0,  # Posiciona os pontos no centro
-    marker=dict(size=7, opacity=0.7),  # Melhora a visualização dos pontos
-)
+    # Violin plot para Median Income (similar ao anterior)
+    fig_median = get_figure(PAGE, "state_median_violin", state_median_violin_figure, selected_state_pdf=selected_state_pdf)
 
-fig_median.update_layout(
-    title_text="Median Income by State",
-    yaxis_title="Median Income (dollars)",
-    xaxis_title="State",
-)
+    plotly_chart(PAGE, "state_median_violin", fig_median)
 
-fig_median.update_traces(
-    jitter=0.7,
-    pointpos=0,
-    marker=dict(size=7, opacity=0.7),
-    line_width=2.5  # Adicione esta linha para aumentar a espessura da linha da caixa
-)
+    st.markdown(
+        """
+        **Imagem:** O gráfico de Velas (ou Candlestick em inglês)
+        apresenta a mediana de renda por estado, levando
+        em consideração o partido ganhador (Democrata ou Republicano)
+        de cada condado.
+        """
+    )
 
-st.plotly_chart(fig_median)
 
-'''
-**Imagem:** O gráfico de Velas (ou Candlestick em inglês)
-apresenta a mediana de renda por estado, levando
- em consideração o partido ganhador (Democrata ou Republicano)
-   de cada condado.
+states = get_states()
 
-'''
+state_violins(states)
 
 
 '''
@@ -220,72 +103,71 @@ apresenta a mediana de renda por estado, levando
 '''
 
 # Plota um histograma da renda média
-fig, ax = plt.subplots(figsize=(14, 8))
-ax.hist(mod_df['Mean income (dollars)'], bins=50,
-        color='blue', alpha=0.7, density=True)
-ax.set_title('Histograma da Renda Média', fontsize=16)
-ax.set_xlabel('Renda Média (dólares)', fontsize=14)
-ax.set_ylabel('Densidade', fontsize=14)
-st.pyplot(fig)
+# As imagens são lidas dos artefatos pré-calculados, quando existem, ou desenhadas na hora
+histogram_png = get_png(PAGE, "histogram", histogram_figure)
+image(PAGE, "histogram", histogram_png, use_container_width=True)
 
 '''
 **Imagem:** Histograma de renda média dos EUA.
 '''
 
-concetration_percentage = st.slider("Digite o valor da porcentagem desejada.",
-                                    min_value=0.0, max_value=1.0, value=0.05, step=0.01, format="%.2f")
+@st.fragment
+def income_concentration():
+    concetration_percentage = st.slider("Digite o valor da porcentagem desejada.",
+                                        min_value=0.0, max_value=1.0, value=0.05, step=0.01, format="%.2f")
 
-col_pdf, col_cdf = st.columns([1, 1])
+    col_pdf, col_cdf = st.columns([1, 1])
 
+    income_fit = get_mean_income_fit(ALL_STATES, concetration_percentage)
+    x = income_fit["x_percent"]
 
-with col_pdf:
-    [pdf, x] = PDFPlot().plot(
-        desired_percentile=concetration_percentage,
-        real_data=mod_df['Mean income (dollars)'].values,
-    )
-    st.pyplot(pdf)
+    with col_pdf:
+        pdf_png = get_png(PAGE, "pdf", pdf_figure, percentile=round(concetration_percentage, 2))
+        image(PAGE, "pdf", pdf_png, use_container_width=True)
 
-with col_cdf:
-    [cdf, x_2] = CDFPlot().plot(
-        desired_percentile=concetration_percentage,
-        real_data=mod_df['Mean income (dollars)'].values,
-    )
+    with col_cdf:
+        cdf_png = get_png(PAGE, "cdf", cdf_figure, percentile=round(concetration_percentage, 2))
+        image(PAGE, "cdf", cdf_png, use_container_width=True)
 
-    st.pyplot(cdf)
+    st.markdown(
+        f'> **Imagem**: Gráfico de área que indica a probabilidade de {(concetration_percentage * 100):.0f}% da população ganhar até US$ {x:.2f}.')
 
-st.markdown(
-    f'> **Imagem**: Gráfico de área que indica a probabilidade de {(concetration_percentage * 100):.0f}% da população ganhar até US$ {x:.2f}.')
 
-col3, col4 = st.columns([1, 1])
+@st.fragment
+def state_income_concentration(states):
+    col3, col4 = st.columns([1, 1])
 
-with col3:
-    selected_state_pdf = st.selectbox(
-        "Selecione o estado para o PDF de renda",
-        sorted(df["state"].unique())
-    )
+    with col3:
+        selected_state_pdf = st.selectbox(
+            "Selecione o estado para o PDF de renda",
+            states
+        )
 
-with col4:
-    df_state_pdf = mod_df[mod_df["state"] == selected_state_pdf]
+    with col4:
+        concetration_percentage = st.slider(
+            "Digite o valor da porcentagem desejada (por estado).",
+            min_value=0.0,
+            max_value=1.0,
+            value=0.05,
+            step=0.01,
+            format="%.2f"
+        )
 
-    concetration_percentage = st.slider(
-        "Digite o valor da porcentagem desejada (por estado).",
-        min_value=0.0,
-        max_value=1.0,
-        value=0.05,
-        step=0.01,
-        format="%.2f"
+    state_income_fit = get_mean_income_fit(selected_state_pdf, concetration_percentage)
+    x = state_income_fit["x_percent"]
+
+    state_pdf_png = get_png(PAGE, "state_pdf", state_pdf_figure, selected_state_pdf=selected_state_pdf,
+                            percentile=round(concetration_percentage, 2))
+    image(PAGE, "state_pdf", state_pdf_png, use_container_width=True)
+
+    st.markdown(
+        f'> **Imagem**: Gráfico de área que indica a probabilidade de {(concetration_percentage * 100):.0f}% da população de {selected_state_pdf} ganhar até US$ {x:.2f}.'
     )
 
-[pdf, x] = PDFPlot().plot(
-    desired_percentile=concetration_percentage,
-    real_data=np.sort(df_state_pdf['Mean income (dollars)'].values),
-)
 
-st.pyplot(pdf)
+income_concentration()
 
-st.markdown(
-    f'> **Imagem**: Gráfico de área que indica a probabilidade de {(concetration_percentage * 100):.0f}% da população de {selected_state_pdf} ganhar até US$ {x:.2f}.'
-)
+state_income_concentration(states)
 
 
 '''
@@ -304,3 +186,5 @@ New Mexico, New York, seus condados com média e mediana mais altas para renda v
 4 estados todos os condados votaram nos democratas e 1 estado todos os condados votaram nos republicanos.
 Porém, não dá para se concluir com clareza se no geral, os estados com mais concentração de renda tendem a votar majoritariamente no partido republicano ou democrata, já que a comparação muitos estados é afetada pela diferença na quantidade de dados. 
 '''
+
+debug_panel()
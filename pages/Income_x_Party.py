@@ -1,69 +1,8 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-from dataset.get_dataset import get_dataframe
-
-def get_state_df(df, state):
-    state_df = df[df["state"] == state]
-
-    state_df.rename(columns={
-        "2020 Republican vote %": "republican_percentage", 
-        "2020 Democrat vote %": "democrat_percentage",
-        "2020 other vote %": "other_percentage",
-    })
-
-    return state_df
-
-def get_corr_matrix_plot(x_field, y_field):
-
-    correlation_matrix = plot_df[[x_field, y_field]].corr()
-
-    matrix_plot = go.Figure(
-        data=go.Heatmap(
-            z=correlation_matrix.values,
-            x=correlation_matrix.columns,
-            y=correlation_matrix.columns,
-            colorscale='Viridis',
-            showscale=True
-        )
-    )
-    for i in range(len(correlation_matrix)):
-        for j in range(len(correlation_matrix)):
-            matrix_plot.add_annotation(
-                go.layout.Annotation(
-                    text=str(round(correlation_matrix.iloc[i, j], 2)),
-                    x=correlation_matrix.columns[j],
-                    y=correlation_matrix.index[i],
-                    showarrow=False,
-                    font=dict(color='white' if correlation_matrix.iloc[i, j] < 0.5 else 'black')
-                )
-            )
-    matrix_plot.update_layout(
-        title=f"{x_field} x Party votes",
-        xaxis_title=x_field,
-        yaxis_title='Party Votes (percentage)'
-    )
-
-    return matrix_plot
-
-def get_scatter_plot(x_field, y_field, x_title, y_title, title):
-
-    plot = px.scatter(
-        plot_df, 
-        x=x_field, 
-        y=y_field, 
-        title=title
-    )
-
-    plot.update_traces(marker=dict(color=plot_color))
-
-    plot.update_layout(
-        xaxis_title=x_title,
-        yaxis_title=y_title,
-    )
-
-    return plot
+from dataset.bootstrap import METHOD_NAMES, METHODS
+from figures.artifacts import get_figure
+from figures.income_x_party import PAGE, PARTIES, get_views, matrix_figure, scatter_figure
+from helpers.timing import debug_panel, plotly_chart
 
 
 st.set_page_config(
@@ -82,106 +21,77 @@ st.markdown(
 
 st.write("# Income x Party")
 
-df = get_dataframe()
-
 view_selector, party_selector = st.columns(2)
-views = df["state"].unique().tolist()
-views.insert(0, "All")
 
 with view_selector:
-    view = st.selectbox("", views)
+    view = st.selectbox("", get_views())
 with party_selector:
-    party = st.selectbox("", ["Democrats", "Republicans"])
-
-if view != "All":
-    plot_df = get_state_df(df, view)
-else:
-    plot_df = df.copy()
-
-republican_color = "#F2545B"
-democrat_color = "#216681"
-
-if party == "Democrats":
-    y_axis_field = "2020 Democrat vote %"
-    plot_color = democrat_color
-else:
-    y_axis_field = "2020 Republican vote %"
-    plot_color = republican_color
+    party = st.selectbox("", PARTIES)
 
 medianCol1, meanCol1 = st.columns(2)
 giniCol1 = st.columns(1)[0]
 
-gini_scatter_plot = get_scatter_plot(
-    "Gini Index", 
-    y_axis_field, 
-    "Gini Index", 
-    "Party Votes (percentage)", 
-    "Gini Index"
-)
+gini_scatter_plot = get_figure(PAGE, "scatter", scatter_figure, view=view, party=party, field="Gini Index")
 
-giniCol1.plotly_chart(gini_scatter_plot, use_container_width=True)
+plotly_chart(PAGE, "scatter", gini_scatter_plot, container=giniCol1, use_container_width=True)
 
 with giniCol1:
     '''
         **Imagem:** scatter plot do gini index com a porcentagem de votos do partido democrata ou republicano
     '''
     
-mean_scatter_plot = get_scatter_plot(
-    "Mean income (dollars)",
-    y_axis_field,
-    "Mean income (dollars)",
-    "Party Votes (percentage)",
-    "Mean income (dollars)"
-)
+mean_scatter_plot = get_figure(PAGE, "scatter", scatter_figure, view=view, party=party, field="Mean income (dollars)")
 
-meanCol1.plotly_chart(mean_scatter_plot, use_container_width=True)
+plotly_chart(PAGE, "scatter", mean_scatter_plot, container=meanCol1, use_container_width=True)
 
 with meanCol1:
     '''
     **Imagem:** scatter plot da media de renda com a porcentagem de votos do partido democrata ou republicano
     '''
 
-median_scatter_plot = get_scatter_plot(
-    "Median income (dollars)",
-    y_axis_field,
-    "Median income (dollars)",
-    "Party Votes (percentage)",
-    "Median income (dollars)"
-)
+median_scatter_plot = get_figure(PAGE, "scatter", scatter_figure, view=view, party=party, field="Median income (dollars)")
 
-medianCol1.plotly_chart(median_scatter_plot, use_container_width=True)
+plotly_chart(PAGE, "scatter", median_scatter_plot, container=medianCol1, use_container_width=True)
 
 with medianCol1:
     '''
     **Imagem:** scatter plot da mediana de renda com a porcentagem de votos do partido democrata ou republicano
     '''
 
-medianCol2, meanCol2 = st.columns(2)
-giniCol2 = st.columns(1)[0]
+# As matrizes mostram o intervalo de confiança bootstrap de cada correlação, pelo método escolhido.
+# Como só elas dependem do método, ficam num fragmento: trocar o método não refaz os gráficos de dispersão
+@st.fragment
+def correlation_matrices(view, party):
+    method = st.radio("Método de correlação", METHODS, format_func=METHOD_NAMES.get, horizontal=True)
 
-gini_matrix_plot = get_corr_matrix_plot("Gini Index", y_axis_field)
+    medianCol2, meanCol2 = st.columns(2)
+    giniCol2 = st.columns(1)[0]
 
-giniCol2.plotly_chart(gini_matrix_plot, use_container_width=True)
+    gini_matrix_plot = get_figure(PAGE, "matrix", matrix_figure, view=view, party=party, field="Gini Index", method=method)
 
-with giniCol2:
-    '''
-        **Imagem:** matriz de correlação do gini index com a porcentagem de votos do partido democrata ou republicano
-    '''
+    plotly_chart(PAGE, "matrix", gini_matrix_plot, container=giniCol2, use_container_width=True)
 
-mean_matrix_plot = get_corr_matrix_plot("Mean income (dollars)", y_axis_field)
+    giniCol2.markdown(
+        "**Imagem:** matriz de correlação do gini index com a porcentagem de votos do partido democrata ou republicano"
+    )
 
-meanCol2.plotly_chart(mean_matrix_plot, use_container_width=True)
+    mean_matrix_plot = get_figure(PAGE, "matrix", matrix_figure, view=view, party=party, field="Mean income (dollars)", method=method)
 
-with meanCol2:
-    '''
-        **Imagem:** matriz de correlação da media de renda com a porcentagem de votos do partido democrata ou republicano
-    '''
+    plotly_chart(PAGE, "matrix", mean_matrix_plot, container=meanCol2, use_container_width=True)
 
-median_matrix_plot = get_corr_matrix_plot("Median income (dollars)", y_axis_field)
+    meanCol2.markdown(
+        "**Imagem:** matriz de correlação da media de renda com a porcentagem de votos do partido democrata ou republicano"
+    )
 
-medianCol2.plotly_chart(median_matrix_plot, use_container_width=True)
+    median_matrix_plot = get_figure(PAGE, "matrix", matrix_figure, view=view, party=party, field="Median income (dollars)", method=method)
 
-with medianCol2:
-    '''
-        **Imagem:** matriz de correlação da mediana de renda com a porcentagem de votos do partido democrata ou republicano
-    '''
\ No newline at end of file
+    plotly_chart(PAGE, "matrix", median_matrix_plot, container=medianCol2, use_container_width=True)
+
+    medianCol2.markdown(
+        "**Imagem:** matriz de correlação da mediana de renda com a porcentagem de votos do partido democrata ou republicano"
+    )
+
+
+correlation_matrices(view, party)
+
+debug_panel()